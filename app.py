@@ -1,41 +1,68 @@
 import streamlit as st
-import pickle
-import pandas as pd
-import plotly.express as px
-import io
+import time
+import uuid
 from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-import base64
-
-# Initialize session state
-if "prediction" not in st.session_state:
-    st.session_state.prediction = None
-if "prediction_history" not in st.session_state:
-    st.session_state.prediction_history = []
+
+# pandas, plotly and reportlab are imported where they are first used so a
+# fresh process can serve its first prediction without loading them.
+
+from batch_score import load_scorer
+from bulk_jobs import MAX_UPLOAD_BYTES, MAX_UPLOAD_ROWS, get_job_manager
+from charts import figure_cache_info, probability_figure, scores_figure, trend_figure, whatif_figure
+from history_store import get_history_store
+from instrumentation import metrics, start_metrics_server
+from lookup_table import FEATURES
+from model_router import DEFAULT_MODEL, router
+from predictor import get_predictor
+from reports import pdf_report, personality_descriptions, report_filename, text_report
+from session_store import get_session_store
+from theme import css_payload_bytes, theme_css, theme_name
+
+# Initialize session state. Prediction results live in the process-wide
+# session store (see session_store.py), which evicts idle sessions.
 if "dark_mode" not in st.session_state:
     st.session_state.dark_mode = False
-
-# Load the trained model and label encoder
+if "bulk_job_id" not in st.session_state:
+    st.session_state.bulk_job_id = None
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+
+# Load the trained model (once per process, shared by all sessions). This uses
+# the flat artifact when present, the precomputed lookup table when it matches
+# the model, and the pickle only as a fallback.
 try:
-    with open("personality_prediction.pkl", "rb") as file:
-        model_payload = pickle.load(file)
-    model = model_payload["model"]
-    le = model_payload["label_encoder"]
+    with metrics.stage("model_load"):
+        scorer = load_scorer()
+    model_artifact = scorer.artifact
+    prediction_table = scorer.table
+    predictor = get_predictor(scorer)
     model_loaded = True
 except FileNotFoundError:
     model_loaded = False
 
-# Personality descriptions
-personality_descriptions = {
-    "extraverted": "You are likely outgoing, sociable, and energetic. You enjoy being around others and are often the life of the party. You thrive in social settings and feel energized by interacting with people.",
-    "serious": "You tend to be thoughtful, disciplined, and goal-oriented. You approach tasks with a structured and organized mindset, and you value responsibility and reliability in yourself and others.",
-    "dependable": "You are reliable, trustworthy, and responsible. People can count on you to follow through on your commitments. You are practical and well-organized, making you a cornerstone in any team or family.",
-    "lively": "You are enthusiastic, cheerful, and full of energy. You bring a positive and vibrant attitude to everything you do. Your spontaneity and optimism are contagious, and you enjoy new and exciting experiences.",
-    "responsible": "You are conscientious, diligent, and accountable for your actions. You have a strong sense of duty and take your obligations seriously. You are a planner and prefer to be prepared for all outcomes.",
-}
+history_store = get_history_store()
+session_store = get_session_store()
+session = session_store.get(st.session_state.session_id)
+
+# A/B routing: ?model=<name> picks a variant from models.json, otherwise the
+# session is assigned one by traffic weight and keeps it across reruns.
+routing_error = None
+try:
+    model_name = router.route(st.query_params.get("model"), key=st.session_state.session_id)
+    model_features = FEATURES if model_name == DEFAULT_MODEL else router.features(model_name)
+except (ValueError, FileNotFoundError) as exc:
+    routing_error = str(exc)
+    model_name, model_features = DEFAULT_MODEL, FEATURES
+
+start_metrics_server()
+metrics.register_gauge("report_cache_hits", lambda: text_report.cache_info().hits + pdf_report.cache_info().hits)
+metrics.register_gauge("report_cache_misses", lambda: text_report.cache_info().misses + pdf_report.cache_info().misses)
+metrics.register_gauge("figure_cache_hits", lambda: figure_cache_info()["hits"])
+metrics.register_gauge("figure_cache_misses", lambda: figure_cache_info()["misses"])
+metrics.register_gauge("sessions", lambda: len(session_store))
+metrics.register_gauge("sessions_evicted", lambda: session_store.evicted)
+
+# Personality descriptions live in reports.py so report workers can use them
 
 personality_icons = {
     "extraverted": "🎉",
@@ -46,39 +73,6 @@ personality_icons = {
 }
 
 
-# Define colors based on theme (black and white only, monochrome)
-@st.cache_data
-def get_theme_colors():
-    if st.session_state.dark_mode:
-        return {
-            "bg": "#000000",
-            "secondary_bg": "#111111",
-            "glass_bg": "rgba(17, 17, 17, 0.9)",
-            "text": "#ffffff",
-            "text_secondary": "#cccccc",
-            "primary": "#666666",
-            "primary_hover": "#888888",
-            "accent": "#999999",
-            "card_bg": "rgba(17, 17, 17, 0.95)",
-            "border": "#333333",
-            "shadow": "0 25px 50px -12px rgba(0, 0, 0, 0.5)",
-        }
-    else:
-        return {
-            "bg": "#ffffff",
-            "secondary_bg": "#f5f5f5",
-            "glass_bg": "rgba(255, 255, 255, 0.95)",
-            "text": "#000000",
-            "text_secondary": "#333333",
-            "primary": "#666666",
-            "primary_hover": "#444444",
-            "accent": "#555555",
-            "card_bg": "rgba(255, 255, 255, 0.98)",
-            "border": "#dddddd",
-            "shadow": "0 25px 50px -12px rgba(0, 0, 0, 0.1)",
-        }
-
-
 # Streamlit app layout
 st.set_page_config(
     page_title="Personality Insights",
@@ -87,208 +81,10 @@ st.set_page_config(
 )
 
 
-# Custom CSS for monochrome black and white UI
+# Custom CSS for monochrome black and white UI. The stylesheet itself is a
+# static file; each rerun only sends a link to it plus the theme's variables.
 def load_css():
-    colors = get_theme_colors()
-    css = f"""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-        
-        .main {{
-            background: linear-gradient(135deg, {colors['bg']} 0%, {colors['secondary_bg']} 100%);
-            font-family: 'Inter', sans-serif;
-            backdrop-filter: blur(10px);
-        }}
-        .stApp {{
-            background: transparent;
-        }}
-        [data-testid="stAppViewContainer"] > .main {{
-            background: {colors['bg']};
-        }}
-        h1, h2, h3 {{
-            color: {colors['text']};
-            font-weight: 700;
-            letter-spacing: -0.025em;
-        }}
-        .stText, .stMarkdown {{
-            color: {colors['text']};
-        }}
-        .stSlider > div > div > div {{
-            color: {colors['text']};
-            font-weight: 500;
-        }}
-        .stSlider label {{
-            color: {colors['text_secondary']};
-        }}
-        .stSlider .stMarkdown {{
-            color: {colors['text']};
-        }}
-        .glass-card {{
-            background: {colors['glass_bg']};
-            backdrop-filter: blur(20px);
-            -webkit-backdrop-filter: blur(20px);
-            border: 1px solid {colors['border']};
-            border-radius: 24px;
-            padding: 2rem;
-            box-shadow: {colors['shadow']};
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        }}
-        .glass-card:hover {{
-            transform: translateY(-4px);
-            box-shadow: 0 35px 60px -12px rgba(0, 0, 0, 0.3);
-        }}
-        .input-section {{
-            background: {colors['card_bg']};
-            border-radius: 20px;
-            padding: 2.5rem;
-            box-shadow: {colors['shadow']};
-            border: 1px solid {colors['border']};
-            margin-bottom: 2rem;
-        }}
-        .result-section {{
-            background: {colors['card_bg']};
-            border: 1px solid {colors['primary']};
-            color: {colors['text']};
-            padding: 3.5rem;
-            border-radius: 24px;
-            text-align: center;
-            box-shadow: {colors['shadow']};
-            backdrop-filter: blur(10px);
-        }}
-        .result-section p {{
-            color: {colors['text']};
-        }}
-        .stButton > button {{
-            background: {colors['primary']};
-            color: {colors['text']};
-            border: none;
-            border-radius: 50px;
-            padding: 1rem 2.5rem;
-            font-size: 1.1rem;
-            font-weight: 600;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-            position: relative;
-            overflow: hidden;
-        }}
-        .stButton > button:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 20px 40px rgba(0,0,0,0.3);
-            background: {colors['primary_hover']};
-        }}
-        .stButton > button::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: -100%;
-            width: 100%;
-            height: 100%;
-            background: linear-gradient(90deg, transparent, rgba(255,255,255,0.2), transparent);
-            transition: left 0.5s;
-        }}
-        .stButton > button:hover::before {{
-            left: 100%;
-        }}
-        .stExpander > div > label {{
-            color: {colors['text']};
-            font-weight: 500;
-        }}
-        .stExpander > div > div {{
-            color: {colors['text_secondary']};
-        }}
-        .chart-container {{
-            background: {colors['card_bg']};
-            padding: 1.5rem;
-            border-radius: 16px;
-            border: 1px solid {colors['border']};
-            box-shadow: {colors['shadow']};
-        }}
-        .theme-toggle {{
-            position: fixed;
-            top: 1.5rem;
-            right: 1.5rem;
-            z-index: 1000;
-            background: {colors['card_bg']};
-            border: 1px solid {colors['border']};
-            border-radius: 50%;
-            width: 50px;
-            height: 50px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            cursor: pointer;
-            box-shadow: {colors['shadow']};
-            transition: all 0.3s ease;
-            color: {colors['text']};
-            font-size: 1.2rem;
-        }}
-        .theme-toggle:hover {{
-            transform: scale(1.05);
-            box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-        }}
-        .metric-container {{
-            background: {colors['primary']};
-            color: {colors['text']};
-            padding: 1rem;
-            border-radius: 16px;
-            text-align: center;
-        }}
-        .metric-container h3 {{
-            color: {colors['text']} !important;
-            margin: 0;
-            font-size: 2rem;
-        }}
-        .metric-container p {{
-            color: {colors['text']} !important;
-            margin: 0;
-            opacity: 0.9;
-        }}
-        .stInfo {{
-            background: {colors['card_bg']};
-            color: {colors['text_secondary']};
-            border: 1px solid {colors['border']};
-            border-radius: 8px;
-        }}
-        .stSuccess {{
-            background: {colors['card_bg']};
-            color: {colors['text']};
-            border: 1px solid {colors['border']};
-            border-radius: 8px;
-        }}
-        .stError {{
-            background: {colors['card_bg']};
-            color: {colors['text']};
-            border: 1px solid {colors['border']};
-            border-radius: 8px;
-        }}
-        .stTabs [data-baseweb="tab-list"] {{
-            background: {colors['card_bg']};
-            border-radius: 12px;
-            padding: 4px;
-            border: 1px solid {colors['border']};
-        }}
-        .stTabs [data-baseweb="tab"] {{
-            color: {colors['text_secondary']};
-            background: transparent;
-            border-radius: 8px;
-        }}
-        .stTabs [data-baseweb="tab"]:hover {{
-            color: {colors['text']};
-            background: {colors['glass_bg']};
-        }}
-        .stTabs [aria-selected="true"] {{
-            color: {colors['primary']};
-            background: {colors['glass_bg']};
-        }}
-        .stMetric {{
-            background: {colors['card_bg']};
-            border-radius: 8px;
-            padding: 1rem;
-            border: 1px solid {colors['border']};
-        }}
-    </style>
-    """
-    st.markdown(css, unsafe_allow_html=True)
+    st.markdown(theme_css(theme_name(st.session_state.dark_mode)), unsafe_allow_html=True)
 
 
 # Dark Mode Toggle
@@ -321,8 +117,55 @@ if not model_loaded:
     )
     st.stop()
 
+with st.sidebar.expander("⚙️ Model status"):
+    st.caption(
+        f"Loaded in {model_artifact.load_seconds * 1000:.1f} ms · "
+        f"~{model_artifact.memory_bytes / 1024:.0f} KiB RSS on load · "
+        f"{model_artifact.size / 1024:.0f} KiB on disk · "
+        f"sha256 {model_artifact.sha256[:12]}"
+    )
+    st.caption(
+        f"Serving data version {(scorer.data_sha256 or 'unknown')[:12]} · "
+        f"training key {(scorer.training_key or 'unknown')[:12]}"
+    )
+    st.caption(
+        "Predictions served from the precomputed lookup table."
+        if prediction_table is not None
+        else "Lookup table missing or stale; predictions use the forest directly."
+    )
+    st.caption(
+        f"Theme payload per rerun: "
+        f"{css_payload_bytes(theme_name(st.session_state.dark_mode))} bytes"
+    )
+
+with st.sidebar.expander("🧪 Model variants"):
+    st.caption(f"This session is served by **{model_name}**.")
+    if routing_error:
+        st.warning(f"Falling back to the default model: {routing_error}")
+    else:
+        variant_stats = router.stats()
+        st.dataframe(
+            [
+                {"model": name, "weight": entry.get("weight", 0), **variant_stats.get(name, {})}
+                for name, entry in router.manifest().items()
+            ],
+            use_container_width=True,
+        )
+
+# Optional admin panel (?admin=1) with the same numbers as the /metrics endpoint
+if metrics.enabled and st.query_params.get("admin") == "1":
+    with st.sidebar.expander("📈 Performance metrics", expanded=True):
+        snapshot = metrics.snapshot()
+        st.dataframe(
+            [{"stage": name, **values} for name, values in sorted(snapshot["stages"].items())],
+            use_container_width=True,
+        )
+        st.json(snapshot["counters"])
+        st.caption("Sessions held in memory")
+        st.json(session_store.stats())
+
 # Tabs for better organization
-tab1, tab2 = st.tabs(["📝 Take Assessment", "📈 Results & Insights"])
+tab1, tab2, tab3 = st.tabs(["📝 Take Assessment", "📈 Results & Insights", "📂 Bulk Scoring"])
 
 with tab1:
     # Input Section with glass effect
@@ -370,6 +213,17 @@ with tab1:
                 help="Rate your emotional stability and tendency to stress.",
             )
 
+        # Variants trained with `model.py --keep-columns` also need these
+        demographics = {}
+        if "Age" in model_features or "Gender" in model_features:
+            col_age, col_gender = st.columns(2, gap="medium")
+            if "Age" in model_features:
+                with col_age:
+                    demographics["Age"] = st.number_input("🎂 Age", 5, 100, 25)
+            if "Gender" in model_features:
+                with col_gender:
+                    demographics["Gender"] = st.selectbox("👤 Gender", ["Female", "Male"])
+
         st.markdown("</div>", unsafe_allow_html=True)
 
     # Prediction Button with shine effect
@@ -379,31 +233,55 @@ with tab1:
             "🔮 **Reveal My Trait**", use_container_width=True, type="primary"
         ):
             with st.spinner("🔄 Analyzing your responses with AI precision..."):
-                user_input = pd.DataFrame(
-                    {
-                        "openness": [openness],
-                        "neuroticism": [neuroticism],
-                        "conscientiousness": [conscientiousness],
-                        "agreeableness": [agreeableness],
-                        "extraversion": [extraversion],
-                    }
+                with metrics.stage("predict"):
+                    if model_name == DEFAULT_MODEL:
+                        start = time.perf_counter()
+                        inference = predictor.infer(
+                            openness,
+                            neuroticism,
+                            conscientiousness,
+                            agreeableness,
+                            extraversion,
+                        )
+                        router.observe(DEFAULT_MODEL, time.perf_counter() - start)
+                        class_names = predictor.class_names
+                    else:
+                        class_names, inference = router.infer(
+                            model_name,
+                            {
+                                "openness": openness,
+                                "neuroticism": neuroticism,
+                                "conscientiousness": conscientiousness,
+                                "agreeableness": agreeableness,
+                                "extraversion": extraversion,
+                                **demographics,
+                            },
+                        )
+                if model_name == DEFAULT_MODEL:
+                    metrics.count("table_hit" if prediction_table is not None else "table_miss")
+                prediction_label = inference.label
+                predicted_at = datetime.now()
+                # The probability vector and a packed history entry; the top
+                # traits and margin are derived from it when rendering
+                session.record(
+                    class_names,
+                    prediction_label,
+                    inference.probabilities,
+                    model_name,
+                    (openness, neuroticism, conscientiousness, agreeableness, extraversion),
+                    predicted_at.timestamp(),
                 )
-
-                prediction_encoded = model.predict(user_input)
-                prediction_label = le.inverse_transform(prediction_encoded)[0]
-                st.session_state.prediction = prediction_label
-                st.session_state.prediction_history.append(
+                # Persist off the request path; the session keeps only a short window
+                history_store.record(
+                    predicted_at.strftime("%Y-%m-%d %H:%M"),
+                    prediction_label,
                     {
-                        "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                        "trait": prediction_label,
-                        "scores": {
-                            "openness": openness,
-                            "conscientiousness": conscientiousness,
-                            "extraversion": extraversion,
-                            "agreeableness": agreeableness,
-                            "neuroticism": neuroticism,
-                        },
-                    }
+                        "openness": openness,
+                        "conscientiousness": conscientiousness,
+                        "extraversion": extraversion,
+                        "agreeableness": agreeableness,
+                        "neuroticism": neuroticism,
+                    },
                 )
                 st.success(
                     "✅ Analysis complete! Switch to the 'Results & Insights' tab to view your modern profile. 🎉"
@@ -411,12 +289,12 @@ with tab1:
                 st.rerun()
 
 with tab2:
-    if st.session_state.prediction:
+    if session.label:
         # Result Section with glassmorphism
         col_res, _ = st.columns([1, 3])
         with col_res:
             st.markdown('<div class="result-section">', unsafe_allow_html=True)
-            prediction_label = st.session_state.prediction
+            prediction_label = session.label
             icon = personality_icons.get(prediction_label, "💡")
 
             st.markdown(
@@ -427,63 +305,36 @@ with tab2:
             """,
                 unsafe_allow_html=True,
             )
-            st.markdown(
-                """
-            <style>
-            @keyframes pulse {
-                0%, 100% { opacity: 1; }
-                50% { opacity: 0.7; }
-            }
-            </style>
-            """,
-                unsafe_allow_html=True,
-            )
             st.markdown("</div>", unsafe_allow_html=True)
 
         # Big Five Chart in modern container
         st.markdown("### 📊 Your Big Five Profile")
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        scores = pd.DataFrame(
-            {
-                "Trait": [
-                    "Openness",
-                    "Conscientiousness",
-                    "Extraversion",
-                    "Agreeableness",
-                    "Neuroticism",
-                ],
-                "Score": [
-                    openness,
-                    conscientiousness,
-                    extraversion,
-                    agreeableness,
-                    neuroticism,
-                ],
-            }
-        )
-        colors = get_theme_colors()
-        fig = px.bar(
-            scores,
-            x="Trait",
-            y="Score",
-            title="Interactive Personality Scores",
-            color="Score",
-            color_continuous_scale="Greys",  # Monochrome grayscale
-            labels={"Score": "Rating (1-10)"},
-            text="Score",
-        )
-        fig.update_traces(texttemplate="%{text}", textposition="outside")
-        fig.update_layout(
-            plot_bgcolor=colors["card_bg"],
-            paper_bgcolor=colors["card_bg"],
-            font_color=colors["text"],
-            font_family="Inter, sans-serif",
-            showlegend=False,
-            xaxis_title="Traits",
-            yaxis_title="Your Score",
-            bargap=0.3,
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        chart_theme = theme_name(st.session_state.dark_mode)
+        with metrics.stage("plotly_figure"):
+            fig = scores_figure(
+                (openness, conscientiousness, extraversion, agreeableness, neuroticism),
+                chart_theme,
+            )
+        st.plotly_chart(fig, use_container_width=True, key="scores_chart")
+
+        confidence = session.confidence()
+        if confidence:
+            top_k = " · ".join(
+                f"{personality_icons.get(name, '💡')} {name.capitalize()} {p:.0%}"
+                for name, p in confidence["top_k"]
+            )
+            st.markdown(
+                f"**Top traits:** {top_k}  \n**Confidence margin:** {confidence['margin']:.0%} over the runner-up"
+                f"  \n**Model:** {confidence.get('model', DEFAULT_MODEL)}"
+            )
+            with metrics.stage("plotly_figure"):
+                proba_fig = probability_figure(
+                    tuple(confidence["probabilities"]),
+                    tuple(confidence["probabilities"].values()),
+                    chart_theme,
+                )
+            st.plotly_chart(proba_fig, use_container_width=True, key="probability_chart")
         st.markdown("</div>", unsafe_allow_html=True)
 
         # Metrics for each trait
@@ -515,59 +366,163 @@ with tab2:
                 unsafe_allow_html=True,
             )
 
+        # What-if explorer: 50 neighbouring inputs answered in one batch by the
+        # session's model (memoized for the default one)
+        st.markdown("### 🔍 What-If Explorer")
+        whatif_scores = (
+            openness,
+            neuroticism,
+            conscientiousness,
+            agreeableness,
+            extraversion,
+        )
+        with metrics.stage("whatif"):
+            if model_name == DEFAULT_MODEL:
+                whatif = predictor.sensitivity(whatif_scores)
+                whatif_classes = predictor.class_names
+            else:
+                whatif_classes, whatif = router.sensitivity(
+                    model_name, {**dict(zip(FEATURES, whatif_scores)), **demographics}
+                )
+        trait_titles = [name.capitalize() for name in FEATURES]
+        whatif_trait = st.selectbox(
+            "Vary one trait while holding the others at your current scores",
+            trait_titles,
+        )
+        trait_index = trait_titles.index(whatif_trait)
+        with metrics.stage("plotly_figure"):
+            whatif_fig = whatif_figure(
+                tuple(whatif.levels.tolist()),
+                tuple(map(tuple, whatif.probabilities[trait_index].tolist())),
+                tuple(str(name) for name in whatif_classes),
+                whatif_trait,
+                whatif_scores[trait_index],
+                chart_theme,
+            )
+        st.plotly_chart(whatif_fig, use_container_width=True, key="whatif_chart")
+        st.dataframe(
+            {
+                "Trait": trait_titles,
+                **{
+                    str(level): [str(label).capitalize() for label in whatif.labels[:, i]]
+                    for i, level in enumerate(whatif.levels)
+                },
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        # Trends across every stored assessment, aggregated in SQLite
+        st.markdown("### 📅 Assessment Trends")
+        trait_counts = history_store.trait_counts()
+        if trait_counts:
+            count_cols = st.columns(len(trait_counts))
+            for col, (trait, count) in zip(count_cols, trait_counts.items()):
+                with col:
+                    st.metric(
+                        f"{personality_icons.get(trait, '💡')} {trait.capitalize()}", count
+                    )
+            with metrics.stage("plotly_figure"):
+                trend_fig = trend_figure(
+                    tuple(history_store.daily_counts()), history_store.total(), chart_theme
+                )
+            st.plotly_chart(trend_fig, use_container_width=True, key="trend_chart")
+
         # Export Options
         st.markdown("### 💾 Export Your Insights")
         col_export1, col_export2 = st.columns(2)
+        # Reports are cached by (label, scores, theme, prediction time), and the
+        # PDF is only rendered once the user asks for it.
+        report_scores = (
+            openness,
+            neuroticism,
+            conscientiousness,
+            agreeableness,
+            extraversion,
+        )
+        report_date = session.last_date() or datetime.now().strftime("%Y-%m-%d %H:%M")
+        report_theme = theme_name(st.session_state.dark_mode)
         with col_export1:
-            text_result = f"""Personality Insight Report
-Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}
-Dominant Trait: {prediction_label.capitalize()}
-Description: {personality_descriptions.get(prediction_label)}
-Big Five Scores:
-- Openness: {openness}/10
-- Conscientiousness: {conscientiousness}/10
-- Extraversion: {extraversion}/10
-- Agreeableness: {agreeableness}/10
-- Neuroticism: {neuroticism}/10"""
             st.download_button(
                 "📝 Download TXT Report",
-                text_result,
-                f"personality_report_{prediction_label}.txt",
+                text_report(prediction_label, report_scores, report_date),
+                report_filename(prediction_label, "txt"),
                 "text/plain",
                 use_container_width=True,
             )
 
         with col_export2:
-            # Generate actual PDF using reportlab
-            def create_pdf():
-                buffer = io.BytesIO()
-                c = canvas.Canvas(buffer, pagesize=letter)
-                width, height = letter
-                c.setFont("Helvetica-Bold", 16)
-                c.drawString(100, height - 100, "Personality Insight Report")
-                c.setFont("Helvetica", 12)
-                y = height - 150
-                lines = text_result.split("\n")
-                for line in lines:
-                    c.drawString(100, y, line)
-                    y -= 20
-                c.save()
-                buffer.seek(0)
-                return buffer.getvalue()
-
-            pdf_data = create_pdf()
-            st.download_button(
-                "📄 Download PDF Report",
-                pdf_data,
-                f"personality_report_{prediction_label}.pdf",
-                "application/pdf",
-                use_container_width=True,
-            )
+            pdf_key = (prediction_label, report_scores, report_theme, report_date)
+            if st.session_state.get("pdf_requested") == pdf_key:
+                with metrics.stage("pdf_render"):
+                    pdf_data = pdf_report(*pdf_key)
+                st.download_button(
+                    "📄 Download PDF Report",
+                    pdf_data,
+                    report_filename(prediction_label, "pdf"),
+                    "application/pdf",
+                    use_container_width=True,
+                )
+            elif st.button("📄 Prepare PDF Report", use_container_width=True):
+                st.session_state.pdf_requested = pdf_key
+                st.rerun()
     else:
         st.info(
             "👆 Complete the assessment in the 'Take Assessment' tab to unlock your modern results!"
         )
 
+with tab3:
+    # Upload mode: files are scored on a background thread pool and the results
+    # are spooled to disk; the session only remembers the job id.
+    st.markdown("### 📂 Score a File of Respondents")
+    st.markdown(
+        f"Upload a CSV with the columns {', '.join(f'`{name}`' for name in FEATURES)} "
+        f"(1-10 each). Up to {MAX_UPLOAD_ROWS:,} rows and {MAX_UPLOAD_BYTES // 2 ** 20} MB; "
+        "every other column is kept in the results."
+    )
+    bulk_jobs = get_job_manager()
+    uploaded = st.file_uploader("Respondents CSV", type=["csv"], key="bulk_upload")
+    if uploaded is not None and st.button("🚀 Score File", type="primary"):
+        try:
+            st.session_state.bulk_job_id = bulk_jobs.submit(uploaded, uploaded.name).id
+        except ValueError as exc:
+            st.error(f"❌ {exc}")
+
+    job = bulk_jobs.get(st.session_state.bulk_job_id) if st.session_state.bulk_job_id else None
+    polling = job is not None and not job.done
+
+    # Polls once a second while the job runs; the rest of the page is untouched
+    @st.fragment(run_every=1.0 if polling else None)
+    def bulk_progress():
+        if job is None:
+            return
+        if job.done and polling:
+            # One full rerun to leave polling mode
+            st.rerun()
+        if not job.done:
+            st.progress(
+                job.progress,
+                text=f"Scoring '{job.name}': {job.rows_done:,} of {job.rows_total:,} rows",
+            )
+            return
+        if job.status == "failed":
+            st.error(f"❌ Scoring '{job.name}' failed: {job.error}")
+        else:
+            st.success(
+                f"✅ Scored {job.rows_done:,} rows from '{job.name}' in "
+                f"{job.finished_at - job.created_at:.1f}s."
+            )
+            with open(job.output_path, "rb") as file:
+                st.download_button(
+                    "💾 Download Results (CSV with per-trait probabilities)",
+                    file,
+                    job.result_filename(),
+                    "text/csv",
+                    use_container_width=True,
+                )
+
+    bulk_progress()
+
 # Footer
 st.markdown("---")
 st.markdown(
@@ -0,0 +1,218 @@
+import argparse
+import os
+import sys
+import time
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+from flat_forest import FLAT_MODEL_PATH, FlatForest
+from lookup_table import FEATURES, SCORE_MAX, SCORE_MIN, TABLE_PATH, check_input_range, load_table, score_index
+from model_registry import MODEL_PATH, LoadedArtifact, registry
+
+LABEL_COLUMN = "predicted_personality"
+
+
+class Scorer(NamedTuple):
+    model: Any
+    class_names: np.ndarray
+    table: Optional[np.ndarray]
+    model_sha256: str
+    artifact: LoadedArtifact
+    data_sha256: Optional[str] = None
+    training_key: Optional[str] = None
+
+
+def load_scorer(model_path=MODEL_PATH, table_path=TABLE_PATH, flat_path=FLAT_MODEL_PATH):
+    # Prefer the pickle-free flat artifact: it maps in without importing scikit-learn
+    try:
+        artifact = registry.get(flat_path, loader=FlatForest.load)
+        model = artifact.value
+        class_names, model_sha256 = model.classes, model.header["model_sha256"]
+        versions = model.header
+    except FileNotFoundError:
+        artifact = registry.get(model_path)
+        model = artifact.value["model"]
+        class_names = artifact.value["label_encoder"].classes_[model.classes_]
+        model_sha256 = artifact.sha256
+        versions = artifact.value
+
+    table = None
+    try:
+        candidate, meta = registry.get(table_path, loader=load_table).value
+        if meta["model_sha256"] == model_sha256:
+            table = candidate
+    except (FileNotFoundError, ValueError):
+        pass
+    return Scorer(model, class_names, table, model_sha256, artifact,
+                  versions.get("data_sha256"), versions.get("training_key"))
+
+
+def _in_table_range(table, X):
+    return table is not None and X.size and X.min() >= SCORE_MIN and X.max() <= SCORE_MAX
+
+
+def predict_proba_chunk(model, table, X):
+    # X is an (n, 5) integer array in FEATURES order
+    if _in_table_range(table, X):
+        return np.asarray(table["proba"][score_index(X)], dtype=np.float64)
+    if isinstance(model, FlatForest):
+        return model.predict_proba(X)
+    import pandas as pd
+
+    return model.predict_proba(pd.DataFrame(X, columns=FEATURES))
+
+
+def predict_chunk(model, table, X):
+    # Returns (class index, probabilities); table rows carry the exact argmax
+    if _in_table_range(table, X):
+        rows = table[score_index(X)]
+        return rows["label"].astype(np.intp), np.asarray(rows["proba"], dtype=np.float64)
+    proba = predict_proba_chunk(model, None, X)
+    return proba.argmax(axis=1), proba
+
+
+def score_chunk(scorer, chunk, keep_input=False):
+    import pandas as pd
+
+    X = chunk[FEATURES].to_numpy(dtype=np.int64)
+    labels, proba = predict_chunk(scorer.model, scorer.table, X)
+    out = chunk.reset_index(drop=True) if keep_input else pd.DataFrame()
+    out[LABEL_COLUMN] = scorer.class_names[labels]
+    for i, name in enumerate(scorer.class_names):
+        out[f"proba_{name}"] = proba[:, i].astype(np.float32)
+    return out
+
+
+def read_checked_chunks(input_path, usecols, columns=FEATURES, chunksize=100_000):
+    # The numeric columns come back as range-checked uint8; a value out of
+    # range raises ValueError naming the rows instead of wrapping around.
+    import pandas as pd
+
+    dtype = {name: np.int64 for name in columns}
+    for chunk in pd.read_csv(input_path, usecols=usecols, dtype=dtype, chunksize=chunksize):
+        for name in columns:
+            chunk[name] = check_input_range(name, chunk[name].to_numpy(), chunk.index)
+        yield chunk
+
+
+def iter_scored_chunks(input_path, scorer, chunksize=100_000, keep_input=False):
+    usecols = None if keep_input else FEATURES
+    for chunk in read_checked_chunks(input_path, usecols, chunksize=chunksize):
+        yield score_chunk(scorer, chunk, keep_input=keep_input)
+
+
+class _CsvSink:
+    def __init__(self, path):
+        self.path = path
+        self._header = True
+
+    def write(self, frame):
+        frame.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        pass
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            sys.exit("Error: writing Parquet requires the 'pyarrow' package.")
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self._writer = None
+
+    def write(self, frame):
+        batch = self._pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, batch.schema)
+        self._writer.write_table(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_sink(path, fmt=None):
+    fmt = fmt or ("parquet" if path.endswith(".parquet") else "csv")
+    return _ParquetSink(path) if fmt == "parquet" else _CsvSink(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score a survey CSV in bounded-memory chunks with the trained model."
+    )
+    parser.add_argument("input", help="CSV with the data/personality_prediction.csv columns.")
+    parser.add_argument("output", help="Output file (.csv or .parquet).")
+    parser.add_argument("--format", choices=["csv", "parquet"])
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--table", default=TABLE_PATH)
+    parser.add_argument("--flat-model", default=FLAT_MODEL_PATH)
+    parser.add_argument(
+        "--keep-input", action="store_true", help="Copy the input columns into the output."
+    )
+    parser.add_argument("--model-name", help="Score every row with this variant from models.json.")
+    parser.add_argument(
+        "--route-by-weight",
+        action="store_true",
+        help="Split rows across the models.json variants by traffic weight (A/B scoring).",
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        print(f"Error: '{args.input}' not found.")
+        return 1
+
+    router = None
+    if args.model_name or args.route_by_weight:
+        from model_router import csv_columns, iter_routed_chunks, router
+
+        chunks = iter_routed_chunks(args.input, router, args.model_name, args.chunksize, args.keep_input)
+        print(f"Scoring with model variant '{args.model_name}'." if args.model_name
+              else f"Scoring with variants {', '.join(router.weighted_names(csv_columns(args.input)))} "
+                   "by traffic weight.")
+    else:
+        scorer = load_scorer(args.model, args.table, args.flat_model)
+        chunks = iter_scored_chunks(args.input, scorer, args.chunksize, args.keep_input)
+        print("Scoring with the precomputed lookup table." if scorer.table is not None
+              else "Scoring with the random forest.")
+
+    sink = open_sink(args.output, args.format)
+    rows = 0
+    start = time.perf_counter()
+    error = None
+    try:
+        for scored in chunks:
+            sink.write(scored)
+            rows += len(scored)
+            elapsed = time.perf_counter() - start
+            print(f"{rows} rows scored ({rows / elapsed:,.0f} rows/sec)")
+    except ValueError as exc:
+        error = exc
+    finally:
+        sink.close()
+    if error is not None:
+        # e.g. an out-of-range score; don't leave a partly scored file behind
+        if os.path.exists(args.output):
+            os.remove(args.output)
+        print(f"Error: {error}")
+        return 1
+
+    elapsed = time.perf_counter() - start
+    print(f"Scored {rows} rows in {elapsed:.2f}s "
+          f"({rows / max(elapsed, 1e-9):,.0f} rows/sec) -> '{args.output}'.")
+    if router is not None:
+        for name, stats in router.stats().items():
+            print(f"  {name}: {stats['predictions']} rows in {stats['requests']} chunks, "
+                  f"mean {stats['mean_ms']:.1f} ms per chunk")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
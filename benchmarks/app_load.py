@@ -0,0 +1,130 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.app_session import run_session
+
+# Run from the repository root:
+#   python -m benchmarks.app_load --sessions 200 --concurrency 16
+#   python -m benchmarks.app_load --max-p99-ms 250   # non-zero exit on regression
+#
+# Every simulated session is a streamlit.testing.v1.AppTest running app.py.
+# Sessions are spread over --concurrency worker processes so one interpreter's
+# GIL doesn't serialize them; sessions in the same worker share its model
+# registry, caches and session store as browser sessions of one
+# `streamlit run` process do. CPU and RSS are totalled over the workers.
+# Workers are spawned, not forked, so each starts from a clean interpreter.
+
+def percentiles(samples):
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1],
+        "mean_ms": statistics.fmean(ordered),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless multi-session load test of app.py.")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--interactions", type=int, default=12, help="Interactions per session.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds allowed per rerun.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results as JSON to this path.")
+    parser.add_argument("--max-p99-ms", type=float,
+                        help="Exit non-zero if any interaction's p99 rerun latency exceeds this.")
+    parser.add_argument("--history-db", default=os.path.join(tempfile.gettempdir(), "app_load_history.sqlite3"),
+                        help="Where simulated assessments are stored, away from the real history.")
+    args = parser.parse_args(argv)
+    # Set before the workers start so every one of them inherits it; read when
+    # history_store is first imported, i.e. by a worker's first app run
+    os.environ["PERSONALITY_HISTORY_DB"] = args.history_db
+
+    latencies = defaultdict(list)
+    errors = []
+    # Latest and peak RSS reported by each worker process
+    worker_rss = {}
+    worker_peak = defaultdict(int)
+    usage_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.concurrency, mp_context=context) as pool:
+        futures = [
+            pool.submit(run_session, i, args.interactions, args.seed, args.timeout)
+            for i in range(args.sessions)
+        ]
+        for future in futures:
+            try:
+                pid, session_latencies, rss, peak = future.result()
+            except Exception as exc:
+                errors.append(str(exc))
+                continue
+            for name, samples in session_latencies.items():
+                latencies[name].extend(samples)
+            worker_rss[pid] = rss
+            worker_peak[pid] = max(worker_peak[pid], peak)
+    wall = time.perf_counter() - start
+    # Workers' CPU is only accounted once they have exited, i.e. after the pool shut down
+    usage_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+
+    results = {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "interactions_per_session": args.interactions,
+        "wall_seconds": wall,
+        "reruns_per_second": sum(len(s) for s in latencies.values()) / wall,
+        "workers": len(worker_rss),
+        "cpu_seconds": cpu,
+        "cpu_utilization": cpu / wall,
+        "rss_peak_bytes": sum(worker_peak.values()),
+        "rss_peak_per_worker_bytes": max(worker_peak.values(), default=0),
+        "rss_end_bytes": sum(worker_rss.values()),
+        "interactions": {name: percentiles(samples) for name, samples in sorted(latencies.items())},
+        "errors": errors,
+    }
+
+    print(f"{args.sessions} sessions at concurrency {args.concurrency}: {wall:.1f}s wall, "
+          f"{results['reruns_per_second']:.1f} reruns/s, CPU {results['cpu_utilization'] * 100:.0f}%")
+    print(f"RSS over {results['workers']} workers: peak {results['rss_peak_bytes'] / 2 ** 20:.0f} MiB "
+          f"(largest worker {results['rss_peak_per_worker_bytes'] / 2 ** 20:.0f} MiB), "
+          f"end {results['rss_end_bytes'] / 2 ** 20:.0f} MiB")
+    print(f"{'interaction':<12}{'count':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, stats in results["interactions"].items():
+        print(f"{name:<12}{stats['count']:>7}{stats['p50_ms']:>9.1f}{stats['p90_ms']:>9.1f}"
+              f"{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+    for error in errors[:10]:
+        print(f"ERROR: {error}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to '{args.output}'.")
+
+    failed = bool(errors)
+    if args.max_p99_ms is not None:
+        for name, stats in results["interactions"].items():
+            if name != "first_load" and stats["p99_ms"] > args.max_p99_ms:
+                print(f"FAIL: {name} p99 {stats['p99_ms']:.1f} ms exceeds {args.max_p99_ms:.1f} ms")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import os
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+
+# One simulated browser session, run inside a benchmarks.app_load worker.
+# It lives in its own module so workers can unpickle it by name: once a
+# worker has run app.py through AppTest, its __main__ is app.py, and a task
+# pickled as __main__.run_session would no longer resolve.
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+INTERACTIONS = ["slider", "reveal", "theme", "report"]
+
+
+def rss_bytes():
+    # Current RSS where /proc is available, otherwise the peak so far
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (FileNotFoundError, ValueError, OSError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _button(at, label):
+    for button in at.button:
+        if label in str(button.label):
+            return button
+    raise LookupError(f"No button labelled {label!r}.")
+
+
+def _timed(latencies, name, action):
+    start = time.perf_counter()
+    at = action()
+    latencies[name].append((time.perf_counter() - start) * 1000)
+    if at.exception:
+        raise RuntimeError(f"{name} raised: {at.exception[0].value}")
+    return at
+
+
+def run_session(index, interactions, seed, timeout):
+    # Runs in a worker process: (pid, latencies, current RSS, peak RSS)
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + index)
+    latencies = defaultdict(list)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    _timed(latencies, "first_load", at.run)
+    predicted = False
+    for _ in range(interactions):
+        kind = rng.choice(INTERACTIONS if predicted else ["slider", "reveal", "theme"])
+        if kind == "slider":
+            slider = rng.choice(list(at.slider))
+            at = _timed(latencies, "slider", slider.set_value(rng.randint(1, 10)).run)
+        elif kind == "reveal":
+            at = _timed(latencies, "reveal", _button(at, "Reveal My Trait").click().run)
+            predicted = True
+        elif kind == "theme":
+            at = _timed(latencies, "theme", at.button(key="theme_toggle").click().run)
+        else:
+            # Rendering the PDF is the expensive part of a download; the TXT
+            # report is built on every Results rerun anyway. Once prepared, a
+            # repeat download is a plain rerun served from the report cache.
+            try:
+                action = _button(at, "Prepare PDF Report").click().run
+            except LookupError:
+                action = at.run
+            at = _timed(latencies, "report", action)
+            labels = [str(getattr(element.proto, "label", "")) for element in at.get("download_button")]
+            if not any("PDF" in label for label in labels):
+                raise RuntimeError("The PDF download button did not appear.")
+    return os.getpid(), latencies, rss_bytes(), peak_rss_bytes()
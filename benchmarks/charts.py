@@ -0,0 +1,90 @@
+import argparse
+import statistics
+import sys
+import time
+
+import plotly.io as pio
+
+from charts import probability_figure, scores_figure
+from theme import get_theme_colors
+
+# Run from the repository root: python -m benchmarks.charts
+#
+# Times the Results tab's two main charts per rerun: building the figures and
+# serializing them the way st.plotly_chart does.
+
+SCORES = (7, 5, 6, 4, 8)
+CLASSES = ("dependable", "extraverted", "lively", "responsible", "serious")
+PROBABILITIES = (0.12, 0.41, 0.22, 0.15, 0.10)
+
+
+def express_rerun(theme):
+    # What app.py did before: a DataFrame and Plotly Express on every rerun
+    import pandas as pd
+    import plotly.express as px
+
+    scores = pd.DataFrame(
+        {
+            "Trait": ["Openness", "Conscientiousness", "Extraversion", "Agreeableness", "Neuroticism"],
+            "Score": list(SCORES),
+        }
+    )
+    colors = get_theme_colors(theme)
+    fig = px.bar(scores, x="Trait", y="Score", title="Interactive Personality Scores", color="Score",
+                 color_continuous_scale="Greys", labels={"Score": "Rating (1-10)"}, text="Score")
+    fig.update_traces(texttemplate="%{text}", textposition="outside")
+    fig.update_layout(plot_bgcolor=colors["card_bg"], paper_bgcolor=colors["card_bg"],
+                      font_color=colors["text"], font_family="Inter, sans-serif", showlegend=False,
+                      xaxis_title="Traits", yaxis_title="Your Score", bargap=0.3)
+    proba_fig = px.bar(x=[name.capitalize() for name in CLASSES], y=list(PROBABILITIES),
+                       title="Trait Probabilities", labels={"x": "Trait", "y": "Probability"},
+                       text_auto=".0%", color_discrete_sequence=[colors["primary"]])
+    proba_fig.update_layout(plot_bgcolor=colors["card_bg"], paper_bgcolor=colors["card_bg"],
+                            font_color=colors["text"], font_family="Inter, sans-serif",
+                            yaxis_tickformat=".0%", yaxis_range=[0, 1], bargap=0.3)
+    return [fig, proba_fig]
+
+
+def graph_objects_rerun(theme):
+    scores_figure.cache_clear()
+    probability_figure.cache_clear()
+    return cached_rerun(theme)
+
+
+def cached_rerun(theme):
+    return [scores_figure(SCORES, theme), probability_figure(CLASSES, PROBABILITIES, theme)]
+
+
+def per_rerun_ms(build, theme, repeats):
+    samples = []
+    payload = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        payload = sum(len(pio.to_json(fig.to_dict(), validate=False)) for fig in build(theme))
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), payload
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-rerun cost of the Results tab charts.")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--theme", choices=["light", "dark"], default="light")
+    args = parser.parse_args(argv)
+
+    candidates = [
+        ("before: pandas + plotly.express", express_rerun),
+        ("graph_objects, uncached", graph_objects_rerun),
+        ("graph_objects, cached", cached_rerun),
+    ]
+    baseline = None
+    print(f"{'path':<34}{'ms/rerun':>10}{'speedup':>9}{'JSON bytes':>12}")
+    for name, build in candidates:
+        build(args.theme)  # warm imports and the cache
+        ms, payload = per_rerun_ms(build, args.theme, args.repeats)
+        baseline = baseline or ms
+        print(f"{name:<34}{ms:>10.2f}{baseline / ms:>8.1f}x{payload:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+# Run from the repository root:
+#   python -m benchmarks.cold_start                    # compare against the baseline
+#   python -m benchmarks.cold_start --update-baseline  # record a new baseline
+#   python -m benchmarks.cold_start --profile          # import time per module
+
+BASELINE_PATH = os.path.join("benchmarks", "baselines", "cold_start.json")
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# What a fresh process does up to its first prediction: import streamlit and
+# everything app.py imports, load the model, render the page, then rerun for
+# the Reveal click. A heavy new top-level import in app.py shows up here.
+COLD_START_SNIPPET = """
+import sys
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+reveal = [button for button in at.button if "Reveal My Trait" in str(button.label)]
+if not at.exception and reveal:
+    at = reveal[0].click().run()
+if at.exception or not reveal:
+    raise SystemExit(f"app.py failed: {at.exception[0].value if at.exception else 'no Reveal button'}")
+print(time.perf_counter() - start)
+"""
+
+
+def _snippet_env():
+    # Keep the benchmark's first runs out of the real assessment history
+    env = dict(os.environ)
+    env.setdefault("PERSONALITY_HISTORY_DB", os.path.join(tempfile.gettempdir(), "cold_start_history.sqlite3"))
+    return env
+
+
+def measure_cold_start(runs):
+    in_process = []
+    wall = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", COLD_START_SNIPPET, APP_PATH],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=_snippet_env(),
+        )
+        wall.append(time.perf_counter() - start)
+        in_process.append(float(result.stdout.strip().splitlines()[-1]))
+    return {
+        "runs": runs,
+        "median_seconds": statistics.median(in_process),
+        "min_seconds": min(in_process),
+        "median_wall_seconds": statistics.median(wall),
+    }
+
+
+def profile_imports(top):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", COLD_START_SNIPPET, APP_PATH],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_snippet_env(),
+    )
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    self_us = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        self_us[name.strip().split(".")[0]] += int(own)
+    total = sum(self_us.values())
+    print(f"{'package':<24}{'ms':>10}{'share':>8}")
+    for name, us in sorted(self_us.items(), key=lambda item: -item[1])[:top]:
+        print(f"{name:<24}{us / 1000:>10.1f}{us / total:>8.1%}")
+    print(f"{'total':<24}{total / 1000:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold start to first prediction benchmark.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="Allowed slowdown over the baseline median (0.20 = 20%%).")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--profile", action="store_true",
+                        help="Break cold-start import time down per top-level package.")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profile_imports(args.top)
+        return 0
+
+    result = measure_cold_start(args.runs)
+    print(f"Cold start to first prediction: median {result['median_seconds'] * 1000:.0f} ms "
+          f"(min {result['min_seconds'] * 1000:.0f} ms, process wall "
+          f"{result['median_wall_seconds'] * 1000:.0f} ms over {args.runs} runs)")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(result, file, indent=2)
+        print(f"Baseline written to '{args.baseline}'.")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"FAIL: no baseline at '{args.baseline}'; record one with --update-baseline.")
+        return 1
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    limit = baseline["median_seconds"] * (1 + args.tolerance)
+    if result["median_seconds"] > limit:
+        print(f"FAIL: slower than baseline {baseline['median_seconds'] * 1000:.0f} ms "
+              f"+{args.tolerance:.0%} ({limit * 1000:.0f} ms).")
+        return 1
+    print(f"OK: within {args.tolerance:.0%} of baseline {baseline['median_seconds'] * 1000:.0f} ms.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import write_dataset
+
+# Run from the repository root:
+#   python -m benchmarks.ingest --rows 10000000
+#
+# Each strategy runs in a fresh process so peak RSS is its own; the numbers
+# are the increase over the same process right after importing pandas.
+
+STRATEGIES = {
+    "read_csv (pandas defaults)": """
+data = pd.read_csv(path)
+X = data.drop(columns=['Gender', 'Age', 'Personality'])
+y = data['Personality']
+""",
+    "columnar: convert + map": """
+data = load_columnar(path, digest, {'Gender': {'Female': 0, 'Male': 1}}, cache_dir=cache_dir, refresh=True)
+X = pd.DataFrame({name: data.columns[name] for name in FEATURES})
+y = data.columns['Personality']
+""",
+    "columnar: map cached copy": """
+data = load_columnar(path, digest, cache_dir=cache_dir)
+X = pd.DataFrame({name: data.columns[name] for name in FEATURES})
+y = data.columns['Personality']
+""",
+}
+
+RUNNER = """
+import json, resource, sys, time
+import pandas as pd
+from ingest import load_columnar
+from lookup_table import FEATURES
+path, digest, cache_dir = sys.argv[1:4]
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+{body}
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base
+print(json.dumps({{"seconds": seconds, "peak_rss_kib": peak, "rows": len(y)}}))
+"""
+
+
+def run_strategy(body, path, digest, cache_dir):
+    result = subprocess.run(
+        [sys.executable, "-c", RUNNER.format(body=body), path, digest, cache_dir],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    from model_registry import file_sha256
+
+    parser = argparse.ArgumentParser(description="Load time and peak memory of training-data ingestion.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="Existing CSV to use instead of a synthetic one.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv
+        if path is None:
+            path = os.path.join(tmp, "survey.csv")
+            print(f"Writing {args.rows} synthetic rows...")
+            write_dataset(path, args.rows, seed=args.seed)
+        digest = file_sha256(path)
+        cache_dir = os.path.join(tmp, "columnar")
+        print(f"{'strategy':<30}{'seconds':>10}{'peak RSS MiB':>14}")
+        for name, body in STRATEGIES.items():
+            result = run_strategy(body, path, digest, cache_dir)
+            print(f"{name:<30}{result['seconds']:>10.2f}{result['peak_rss_kib'] / 1024:>14.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import argparse
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from batch_score import load_scorer
+from lookup_table import FEATURES
+from model_registry import MODEL_PATH, load_pickle
+from predictor import Predictor
+
+# Run from the repository root: python -m benchmarks.predict_latency
+
+
+def per_call_us(func, calls, repeats=5):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        samples.append((time.perf_counter() - start) / calls)
+    return statistics.median(samples) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-call latency of single-row prediction paths.")
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    payload = load_pickle(MODEL_PATH)
+    model, le = payload["model"], payload["label_encoder"]
+    scores = [5, 5, 5, 5, 5]
+
+    def dataframe_path():
+        # What app.py used to do on every click
+        frame = pd.DataFrame({name: [value] for name, value in zip(FEATURES, scores)})
+        return le.inverse_transform(model.predict(frame))[0]
+
+    lean = Predictor(model, le.classes_[model.classes_])
+    candidates = [("DataFrame + predict + inverse_transform", dataframe_path),
+                  ("Predictor, scikit-learn trees", lambda: lean.predict(*scores))]
+
+    scorer = load_scorer()
+    if scorer.model is not model:
+        flat = Predictor(scorer.model, scorer.class_names)
+        candidates.append(("Predictor, flat artifact", lambda: flat.predict(*scores)))
+    if scorer.table is not None:
+        table = Predictor(scorer.model, scorer.class_names, scorer.table)
+        candidates.append(("Predictor, lookup table", lambda: table.predict(*scores)))
+
+    expected = dataframe_path()
+    baseline = None
+    print(f"{'path':<42}{'us/call':>10}{'speedup':>9}")
+    for name, func in candidates:
+        result = func()
+        label = result[0] if isinstance(result, tuple) else result
+        if label != expected:
+            print(f"{name}: predicted {label!r}, expected {expected!r}")
+            return 1
+        us = per_call_us(func, args.calls)
+        baseline = baseline or us
+        print(f"{name:<42}{us:>10.1f}{baseline / us:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
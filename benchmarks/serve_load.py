@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+import aiohttp
+import numpy as np
+
+from lookup_table import FEATURES, SCORE_MAX, SCORE_MIN
+
+# Run from the repository root: python -m benchmarks.serve_load --concurrency 1 8 64
+
+
+async def _worker(session, url, rng, requests, latencies):
+    for _ in range(requests):
+        scores = {name: rng.randint(SCORE_MIN, SCORE_MAX) for name in FEATURES}
+        start = time.perf_counter()
+        async with session.post(url, json={"scores": scores}) as response:
+            response.raise_for_status()
+            await response.read()
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_level(url, concurrency, total_requests, seed):
+    latencies = []
+    per_worker = max(1, total_requests // concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _worker(session, url, random.Random(seed + i), per_worker, latencies)
+                for i in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "requests_per_sec": len(latencies) / elapsed,
+    }
+
+
+async def main_async(args):
+    url = args.url.rstrip("/") + "/predict"
+    print(f"{'concurrency':>11} {'requests':>9} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>9}")
+    for concurrency in args.concurrency:
+        result = await run_level(url, concurrency, args.requests, args.seed)
+        print(f"{result['concurrency']:>11} {result['requests']:>9} {result['p50_ms']:>8.2f} "
+              f"{result['p99_ms']:>8.2f} {result['requests_per_sec']:>9.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for serve.py.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per level.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from history_store import SESSION_HISTORY_LIMIT
+from session_store import SessionStore
+
+# Run from the repository root: python -m benchmarks.session_soak
+#
+# Simulates many browser sessions arriving over a few hours of (simulated)
+# time, each making several predictions, and exits non-zero if the session
+# store's memory does not level off.
+
+CLASS_NAMES = np.array(["dependable", "extraverted", "lively", "responsible", "serious"])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def full_session_bytes(store):
+    # Upper bound for one session: a prediction plus a full history window
+    session = store.get("__probe__")
+    for i in range(SESSION_HISTORY_LIMIT + 5):
+        session.record(CLASS_NAMES, CLASS_NAMES[0], np.full(len(CLASS_NAMES), 0.2), "default",
+                       (5, 5, 5, 5, 5), 1_700_000_000 + i)
+    return session.nbytes()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Session memory soak test.")
+    parser.add_argument("--sessions", type=int, default=20_000)
+    parser.add_argument("--predictions", type=int, default=8, help="Predictions per session.")
+    parser.add_argument("--hours", type=float, default=6.0, help="Simulated time the sessions arrive over.")
+    parser.add_argument("--ttl", type=float, default=30 * 60)
+    parser.add_argument("--max-sessions", type=int, default=2000)
+    parser.add_argument("--max-growth", type=float, default=0.10,
+                        help="Allowed growth in traced memory over the second half of the run.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    clock = FakeClock()
+    store = SessionStore(ttl_seconds=args.ttl, max_sessions=args.max_sessions, clock=clock)
+    per_session = full_session_bytes(store)
+    rng = np.random.default_rng(args.seed)
+    step = args.hours * 3600 / args.sessions
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    halfway_bytes = None
+    peak_sessions = 0
+    for i in range(args.sessions):
+        clock.now += step
+        session_id = f"session-{i}"
+        for _ in range(args.predictions):
+            session = store.get(session_id)
+            proba = rng.dirichlet(np.ones(len(CLASS_NAMES)))
+            session.record(CLASS_NAMES, CLASS_NAMES[proba.argmax()], proba, "default",
+                           tuple(rng.integers(1, 11, size=5)), 1_700_000_000 + int(clock.now))
+        # Earlier sessions occasionally come back for another rerun
+        if i and rng.random() < 0.3:
+            store.get(f"session-{rng.integers(0, i)}")
+        peak_sessions = max(peak_sessions, len(store))
+        if i == args.sessions // 2:
+            halfway_bytes = tracemalloc.get_traced_memory()[0]
+    final_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    elapsed = time.perf_counter() - start
+
+    stats = store.stats()
+    bound = args.max_sessions * per_session
+    growth = (final_bytes - halfway_bytes) / max(halfway_bytes, 1)
+    print(f"{args.sessions} sessions x {args.predictions} predictions in {elapsed:.1f}s")
+    print(f"sessions held: {stats['sessions']} (peak {peak_sessions}), evicted: {stats['evicted']}")
+    print(f"accounted session bytes: {stats['bytes'] / 1024:.0f} KiB "
+          f"(bound {bound / 1024:.0f} KiB, largest session {stats['largest_bytes']} B)")
+    print(f"traced memory: {halfway_bytes / 1024:.0f} KiB at halfway, {final_bytes / 1024:.0f} KiB at end "
+          f"({growth * 100:+.1f}%)")
+
+    failures = []
+    if peak_sessions > args.max_sessions:
+        failures.append(f"held {peak_sessions} sessions, cap is {args.max_sessions}")
+    if stats["bytes"] > bound:
+        failures.append(f"session bytes {stats['bytes']} exceed the bound {bound}")
+    if growth > args.max_growth:
+        failures.append(f"memory grew {growth * 100:.1f}% in the second half")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_dataset
+from lookup_table import FEATURES
+from model_registry import MODEL_PATH, load_pickle
+
+# Run from the repository root:
+#   python -m benchmarks.suite                      # compare against the baseline
+#   python -m benchmarks.suite --update-baseline    # record a new baseline
+#   python -m benchmarks.suite --scale full         # include the 10M-row cases
+#
+# Timings only compare on the same machine, so no baseline ships with the
+# repository: record one with --update-baseline on the machine that runs the
+# check and commit benchmarks/baselines/suite.json. Without one the check fails.
+
+BASELINE_PATH = os.path.join("benchmarks", "baselines", "suite.json")
+SCALES = {
+    "quick": {"predict_rows": [1_000, 100_000], "train_rows": [105, 10_000], "trees": [10, 100]},
+    "default": {
+        "predict_rows": [1_000, 100_000, 1_000_000],
+        "train_rows": [105, 10_000, 100_000],
+        "trees": [10, 50, 100],
+    },
+    "full": {
+        "predict_rows": [1_000, 100_000, 1_000_000, 10_000_000],
+        "train_rows": [105, 10_000, 100_000, 1_000_000],
+        "trees": [10, 50, 100],
+    },
+}
+
+
+def timeit(func, repeats, warmup=1):
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "median_ms": statistics.median(samples) * 1000,
+        "min_ms": min(samples) * 1000,
+        "repeats": repeats,
+    }
+
+
+def run_suite(scale, seed, repeats):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import LabelEncoder
+
+    from reports import pdf_report
+
+    config = SCALES[scale]
+    results = {}
+
+    results["pickle_load"] = timeit(lambda: load_pickle(MODEL_PATH), repeats)
+    payload = load_pickle(MODEL_PATH)
+    model, le = payload["model"], payload["label_encoder"]
+
+    row = [5, 5, 5, 5, 5]
+    frame = pd.DataFrame([row], columns=FEATURES)
+    array = np.array([row])
+    results["predict_single_dataframe"] = timeit(lambda: model.predict(frame), repeats * 10)
+    with warnings.catch_warnings():
+        # The model was fitted with feature names; a bare array only warns
+        warnings.simplefilter("ignore", UserWarning)
+        results["predict_single_numpy"] = timeit(lambda: model.predict(array), repeats * 10)
+    encoded = model.predict(frame)
+    results["inverse_transform_single"] = timeit(lambda: le.inverse_transform(encoded), repeats * 10)
+
+    for n_rows in config["predict_rows"]:
+        batch = make_dataset(n_rows, seed=seed)[FEATURES]
+        results[f"predict_proba_batch_{n_rows}"] = timeit(
+            lambda: model.predict_proba(batch), max(1, repeats // 2)
+        )
+
+    for n_rows in config["train_rows"]:
+        data = make_dataset(n_rows, seed=seed)
+        X = data[FEATURES]
+        y = LabelEncoder().fit_transform(data["Personality"])
+        for trees in config["trees"]:
+            results[f"train_{n_rows}_rows_{trees}_trees"] = timeit(
+                lambda: RandomForestClassifier(n_estimators=trees, random_state=42, n_jobs=-1).fit(X, y),
+                max(1, repeats // 3),
+                warmup=0,
+            )
+
+    # Bypass the report cache so every sample renders a fresh PDF
+    render = pdf_report.__wrapped__
+    results["create_pdf"] = timeit(lambda: render("extraverted", (5, 5, 5, 5, 5), "light", "2025-01-01 12:00"), repeats)
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        change = result["median_ms"] / previous["median_ms"] - 1
+        marker = "REGRESSION" if change > threshold else ""
+        print(f"{name:<40}{previous['median_ms']:>12.3f}{result['median_ms']:>12.3f}{change:>+9.1%} {marker}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the inference and training hot paths.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="default")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=9)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Median slowdown that counts as a regression (0.15 = 15%%).")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.scale, args.seed, args.repeats)
+    report = {
+        "scale": args.scale,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to '{args.output}'.")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Baseline written to '{args.baseline}'.")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"FAIL: no baseline at '{args.baseline}'; record one with --update-baseline.")
+        return 1
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    print(f"{'benchmark':<40}{'base ms':>12}{'now ms':>12}{'change':>9}")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"FAIL: {len(regressions)} benchmark(s) regressed more than {args.threshold:.0%}.")
+        return 1
+    print("OK: no regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from lookup_table import FEATURES, SCORE_MAX, SCORE_MIN
+
+SOURCE_PATH = "data/personality_prediction.csv"
+
+
+def make_dataset(n_rows, seed=0, source_path=SOURCE_PATH):
+    # Resample the real survey rows and jitter each score by up to one point,
+    # so larger datasets keep the same label mix and score distribution.
+    source = pd.read_csv(source_path)
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(source), size=n_rows)
+    data = source.iloc[picks].reset_index(drop=True)
+    jitter = rng.integers(-1, 2, size=(n_rows, len(FEATURES)))
+    data[FEATURES] = np.clip(data[FEATURES].to_numpy() + jitter, SCORE_MIN, SCORE_MAX).astype(np.uint8)
+    return data
+
+
+def write_dataset(path, n_rows, seed=0, chunk_rows=1_000_000, source_path=SOURCE_PATH):
+    # Streams in chunks so 10M-row files don't need 10M rows in memory; each
+    # chunk gets its own seed, so the output is identical for a given seed.
+    for index, start in enumerate(range(0, n_rows, chunk_rows)):
+        chunk = make_dataset(min(chunk_rows, n_rows - start), seed=(seed, index), source_path=source_path)
+        chunk.to_csv(path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+    return path
@@ -0,0 +1,155 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from batch_score import iter_scored_chunks, load_scorer, open_sink
+from lookup_table import FEATURES
+
+SPOOL_DIR = os.path.join(".cache", "uploads")
+MAX_UPLOAD_BYTES = 50 * 2 ** 20
+MAX_UPLOAD_ROWS = 1_000_000
+CHUNK_ROWS = 20_000
+# Finished jobs' files are removed after this long
+JOB_TTL_SECONDS = 3600
+
+
+class BulkJob:
+    """One uploaded file being scored in the background; results live on disk."""
+
+    def __init__(self, name, input_path, output_path, rows_total):
+        self.id = os.path.basename(os.path.dirname(input_path))
+        self.name = name
+        self.input_path = input_path
+        self.output_path = output_path
+        self.rows_total = rows_total
+        self.rows_done = 0
+        self.status = "queued"
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    @property
+    def progress(self):
+        return self.rows_done / self.rows_total if self.rows_total else 1.0
+
+    def result_filename(self):
+        stem = os.path.splitext(self.name)[0] or "upload"
+        return f"{stem}_scored.csv"
+
+
+def _check_header(path):
+    with open(path, encoding="utf-8", errors="replace") as file:
+        header = [name.strip().strip('"') for name in file.readline().strip().split(",")]
+    missing = [name for name in FEATURES if name not in header]
+    if missing:
+        raise ValueError(f"The file is missing the columns: {', '.join(missing)}.")
+
+
+def _count_rows(path, max_rows):
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+            if lines - 1 > max_rows:
+                raise ValueError(f"At most {max_rows:,} rows can be scored per upload.")
+    if last != b"\n":
+        lines += 1  # last line without a trailing newline
+    return max(lines - 1, 0)  # minus the header
+
+
+class BulkJobManager:
+    """Scores uploaded CSVs on worker threads so the Streamlit script never waits.
+
+    Each job streams its file through ``batch_score`` in vectorized chunks and
+    appends to a CSV in the spool directory; sessions keep only the job id.
+    """
+
+    def __init__(self, spool_dir=SPOOL_DIR, max_workers=2, max_bytes=MAX_UPLOAD_BYTES,
+                 max_rows=MAX_UPLOAD_ROWS):
+        self.spool_dir = spool_dir
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-score")
+
+    def submit(self, upload, name):
+        # upload is a binary file object, e.g. Streamlit's UploadedFile
+        self._expire()
+        size = getattr(upload, "size", None)
+        if size is not None and size > self.max_bytes:
+            raise ValueError(f"Uploads are limited to {self.max_bytes / 2 ** 20:.0f} MB.")
+        entry = os.path.join(self.spool_dir, uuid.uuid4().hex)
+        os.makedirs(entry)
+        input_path = os.path.join(entry, "input.csv")
+        try:
+            with open(input_path, "wb") as file:
+                shutil.copyfileobj(upload, file, 1 << 20)
+            if os.path.getsize(input_path) > self.max_bytes:
+                raise ValueError(f"Uploads are limited to {self.max_bytes / 2 ** 20:.0f} MB.")
+            _check_header(input_path)
+            rows = _count_rows(input_path, self.max_rows)
+        except Exception:
+            shutil.rmtree(entry, ignore_errors=True)
+            raise
+        job = BulkJob(name, input_path, os.path.join(entry, "scored.csv"), rows)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def _run(self, job):
+        job.status = "running"
+        sink = open_sink(job.output_path, "csv")
+        status = "done"
+        try:
+            scorer = load_scorer()
+            for scored in iter_scored_chunks(job.input_path, scorer, CHUNK_ROWS, keep_input=True):
+                sink.write(scored)
+                job.rows_done += len(scored)
+        except Exception as exc:
+            job.error = str(exc)
+            status = "failed"
+        finally:
+            sink.close()
+            # The scored output includes every input column, so the upload can go
+            try:
+                os.remove(job.input_path)
+            except FileNotFoundError:
+                pass
+            job.finished_at = time.time()
+            job.status = status
+
+    def _expire(self):
+        cutoff = time.time() - JOB_TTL_SECONDS
+        with self._lock:
+            expired = [job for job in self._jobs.values() if job.done and job.finished_at < cutoff]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            shutil.rmtree(os.path.dirname(job.output_path), ignore_errors=True)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    # One pool per process, shared by all sessions like the model registry
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = BulkJobManager()
+        return _manager
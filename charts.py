@@ -0,0 +1,155 @@
+from functools import lru_cache
+
+from theme import get_theme_colors
+
+# Figures are built straight from plotly.graph_objects (no pandas, no Plotly
+# Express) and memoized on plain tuples. Streamlit serializes a cached figure
+# to the same JSON every time, and its forward-message cache then sends the
+# browser a reference instead of the figure again. Cached figures are shared
+# by every session, so callers must not modify them.
+#
+# plotly is imported inside the builders to keep it off the cold-start path.
+FIGURE_CACHE_SIZE = 256
+
+SCORE_TRAITS = ["Openness", "Conscientiousness", "Extraversion", "Agreeableness", "Neuroticism"]
+
+
+def _line_colors():
+    from plotly.colors import sequential
+
+    return sequential.Greys[3:]
+
+
+def _style(fig, theme, **layout):
+    colors = get_theme_colors(theme)
+    fig.update_layout(
+        plot_bgcolor=colors["card_bg"],
+        paper_bgcolor=colors["card_bg"],
+        font_color=colors["text"],
+        font_family="Inter, sans-serif",
+        **layout,
+    )
+    return fig
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def scores_figure(scores, theme):
+    # scores in SCORE_TRAITS order: openness, conscientiousness, extraversion,
+    # agreeableness, neuroticism
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        go.Bar(
+            x=SCORE_TRAITS,
+            y=list(scores),
+            text=list(scores),
+            texttemplate="%{text}",
+            textposition="outside",
+            marker={"color": list(scores), "coloraxis": "coloraxis"},
+            hovertemplate="Trait=%{x}<br>Rating (1-10)=%{y}<extra></extra>",
+        )
+    )
+    return _style(
+        fig,
+        theme,
+        title="Interactive Personality Scores",
+        coloraxis={"colorscale": "Greys", "colorbar": {"title": {"text": "Rating (1-10)"}}},
+        showlegend=False,
+        xaxis_title="Traits",
+        yaxis_title="Your Score",
+        bargap=0.3,
+    )
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def probability_figure(class_names, probabilities, theme):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        go.Bar(
+            x=[str(name).capitalize() for name in class_names],
+            y=list(probabilities),
+            texttemplate="%{y:.0%}",
+            marker_color=get_theme_colors(theme)["primary"],
+            hovertemplate="Trait=%{x}<br>Probability=%{y}<extra></extra>",
+        )
+    )
+    return _style(
+        fig,
+        theme,
+        title="Trait Probabilities",
+        xaxis_title="Trait",
+        yaxis_title="Probability",
+        yaxis_tickformat=".0%",
+        yaxis_range=[0, 1],
+        bargap=0.3,
+    )
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def whatif_figure(levels, probabilities, class_names, trait_title, current_level, theme):
+    # probabilities: one tuple per level, one probability per class
+    import plotly.graph_objects as go
+
+    line_colors = _line_colors()
+    fig = go.Figure()
+    for i, name in enumerate(class_names):
+        label = str(name).capitalize()
+        fig.add_trace(
+            go.Scatter(
+                x=list(levels),
+                y=[row[i] for row in probabilities],
+                name=label,
+                mode="lines+markers",
+                line_color=line_colors[i % len(line_colors)],
+                hovertemplate=f"Trait={label}<br>{trait_title}=%{{x}}<br>Probability=%{{y}}<extra></extra>",
+            )
+        )
+    fig.add_vline(x=current_level, line_dash="dot", line_color=get_theme_colors(theme)["accent"])
+    return _style(
+        fig,
+        theme,
+        title=f"Trait probabilities as {trait_title} goes from 1 to 10",
+        xaxis_title=trait_title,
+        yaxis_title="Probability",
+        yaxis_tickformat=".0%",
+        legend_title_text="Trait",
+    )
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def trend_figure(daily, total, theme):
+    # daily: (day, trait, assessments) rows as returned by HistoryStore.daily_counts
+    import plotly.graph_objects as go
+
+    line_colors = _line_colors()
+    by_trait = {}
+    for day, trait, count in daily:
+        days, counts = by_trait.setdefault(trait, ([], []))
+        days.append(day)
+        counts.append(count)
+    fig = go.Figure()
+    for i, (trait, (days, counts)) in enumerate(by_trait.items()):
+        fig.add_trace(
+            go.Scatter(
+                x=days,
+                y=counts,
+                name=trait,
+                mode="lines+markers",
+                line_color=line_colors[i % len(line_colors)],
+                hovertemplate=f"Trait={trait}<br>Day=%{{x}}<br>Assessments=%{{y}}<extra></extra>",
+            )
+        )
+    return _style(
+        fig,
+        theme,
+        title=f"Assessments per day ({total} total)",
+        xaxis_title="Day",
+        yaxis_title="Assessments",
+        legend_title_text="Trait",
+    )
+
+
+def figure_cache_info():
+    infos = [f.cache_info() for f in (scores_figure, probability_figure, whatif_figure, trend_figure)]
+    return {"hits": sum(i.hits for i in infos), "misses": sum(i.misses for i in infos)}
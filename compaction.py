@@ -0,0 +1,102 @@
+import copy
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from lookup_table import FEATURES, full_input_space
+
+TREE_COUNTS = [5, 10, 20, 40]
+LIMITED_FORESTS = [
+    {'n_estimators': n, 'max_depth': depth, 'max_leaf_nodes': leaves}
+    for n in (10, 25, 50)
+    for depth, leaves in ((3, None), (5, 16), (8, 32))
+]
+DISTILLED_LEAVES = [8, 16, 32, 64, None]
+
+
+def forest_subset(model, n_trees):
+    # Keep the first n fitted trees; everything else about the forest is shared
+    subset = copy.copy(model)
+    subset.estimators_ = model.estimators_[:n_trees]
+    subset.n_estimators = n_trees
+    for attr in ('oob_score_', 'oob_decision_function_'):
+        if hasattr(subset, attr):
+            delattr(subset, attr)
+    return subset
+
+
+def distil_tree(model, max_leaf_nodes, random_state=42):
+    # The input space is small enough to label exhaustively with the forest
+    X = pd.DataFrame(full_input_space(), columns=FEATURES)
+    tree = DecisionTreeClassifier(max_leaf_nodes=max_leaf_nodes, random_state=random_state)
+    return tree.fit(X, model.predict(X))
+
+
+def profile_model(model, X_test, y_test, repeats=50):
+    blob = pickle.dumps(model)
+    start = time.perf_counter()
+    pickle.loads(blob)
+    load_seconds = time.perf_counter() - start
+
+    row = X_test.iloc[:1]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(row)
+    single_seconds = (time.perf_counter() - start) / repeats
+
+    batch = pd.DataFrame(full_input_space()[:10_000], columns=FEATURES)
+    start = time.perf_counter()
+    model.predict(batch)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        'accuracy': float((model.predict(X_test) == np.asarray(y_test)).mean()),
+        'size_bytes': len(blob),
+        'load_ms': load_seconds * 1000,
+        'single_row_ms': single_seconds * 1000,
+        'batch_10k_ms': batch_seconds * 1000,
+    }
+
+
+def candidate_models(model, X_train, y_train, random_state=42):
+    for n in TREE_COUNTS:
+        if n < len(model.estimators_):
+            yield f'first {n} trees', forest_subset(model, n)
+    for params in LIMITED_FORESTS:
+        forest = RandomForestClassifier(random_state=random_state, n_jobs=-1, **params)
+        yield f'forest {params}', forest.fit(X_train, y_train)
+    for leaves in DISTILLED_LEAVES:
+        tree = distil_tree(model, leaves, random_state)
+        if len(tree.classes_) == len(model.classes_):
+            yield f'distilled tree (max_leaf_nodes={leaves})', tree
+
+
+def compact_model(model, X_train, y_train, X_test, y_test, max_accuracy_drop=0.02, random_state=42):
+    baseline = profile_model(model, X_test, y_test)
+    best_name, best_model, best_profile = 'original forest', model, baseline
+    for name, candidate in candidate_models(model, X_train, y_train, random_state):
+        profile = profile_model(candidate, X_test, y_test)
+        print(f"  {name}: accuracy {profile['accuracy'] * 100:.2f}%, "
+              f"{profile['size_bytes'] / 1024:.0f} KiB, {profile['single_row_ms']:.3f} ms/row")
+        if baseline['accuracy'] - profile['accuracy'] > max_accuracy_drop:
+            continue
+        if (profile['size_bytes'], profile['single_row_ms']) < (best_profile['size_bytes'], best_profile['single_row_ms']):
+            best_name, best_model, best_profile = name, candidate, profile
+    return best_name, best_model, baseline, best_profile
+
+
+def print_comparison(before, after):
+    print(f"{'':<16}{'before':>12}{'after':>12}")
+    for key, label in (
+        ('accuracy', 'accuracy %'),
+        ('size_bytes', 'size KiB'),
+        ('load_ms', 'load ms'),
+        ('single_row_ms', 'row ms'),
+        ('batch_10k_ms', '10k batch ms'),
+    ):
+        scale = 100 if key == 'accuracy' else 1 / 1024 if key == 'size_bytes' else 1
+        print(f"{label:<16}{before[key] * scale:>12.3f}{after[key] * scale:>12.3f}")
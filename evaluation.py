@@ -0,0 +1,156 @@
+import hashlib
+import html
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import confusion_matrix, precision_recall_fscore_support
+from sklearn.model_selection import RepeatedStratifiedKFold
+
+CACHE_DIR = os.path.join('.cache', 'evaluation')
+
+
+def _digest(obj):
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def cached_folds(y, data_sha256, n_splits, n_repeats, random_state, cache_dir=CACHE_DIR):
+    # Splits depend only on the labels and the CV settings, so they are shared
+    # by every hyperparameter setting evaluated on the same data.
+    path = os.path.join(cache_dir, 'folds', f'{data_sha256[:16]}_{n_splits}x{n_repeats}_{random_state}.npz')
+    if os.path.exists(path):
+        stored = np.load(path)
+        return [(stored[f'train_{i}'], stored[f'test_{i}']) for i in range(len(stored.files) // 2)]
+    splitter = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+    folds = list(splitter.split(np.zeros(len(y)), y))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    arrays = {}
+    for i, (train_idx, test_idx) in enumerate(folds):
+        arrays[f'train_{i}'] = train_idx
+        arrays[f'test_{i}'] = test_idx
+    np.savez(path, **arrays)
+    return folds
+
+
+def _run_fold(task):
+    index, X, y, train_idx, test_idx, params, random_state, model_path = task
+    if os.path.exists(model_path):
+        with open(model_path, 'rb') as file:
+            model = pickle.load(file)
+        fit_seconds = 0.0
+    else:
+        model = RandomForestClassifier(random_state=random_state, n_jobs=1, **params)
+        start = time.perf_counter()
+        model.fit(X[train_idx], y[train_idx])
+        fit_seconds = time.perf_counter() - start
+        tmp_path = model_path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(model, file)
+        os.replace(tmp_path, model_path)
+    return index, model.predict(X[test_idx]), fit_seconds
+
+
+def evaluate(X, y, class_names, data_sha256, params, n_splits=5, n_repeats=3, random_state=42,
+             n_jobs=-1, cache_dir=CACHE_DIR):
+    features = [str(name) for name in getattr(X, 'columns', [])]
+    X = np.asarray(X)
+    y = np.asarray(y)
+    key = _digest({
+        'data_sha256': data_sha256,
+        'features': features,
+        'params': params,
+        'n_splits': n_splits,
+        'n_repeats': n_repeats,
+        'random_state': random_state,
+        'sklearn': sklearn.__version__,
+    })
+    run_dir = os.path.join(cache_dir, key[:16])
+    report_path = os.path.join(run_dir, 'report.json')
+    if os.path.exists(report_path):
+        with open(report_path) as file:
+            report = json.load(file)
+        report['from_cache'] = True
+        return report
+
+    os.makedirs(run_dir, exist_ok=True)
+    folds = cached_folds(y, data_sha256, n_splits, n_repeats, random_state, cache_dir)
+    tasks = [
+        (i, X, y, train_idx, test_idx, params, random_state, os.path.join(run_dir, f'fold_{i}.pkl'))
+        for i, (train_idx, test_idx) in enumerate(folds)
+    ]
+    workers = os.cpu_count() if n_jobs in (None, -1) else max(1, n_jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_run_fold, tasks))
+
+    labels = np.arange(len(class_names))
+    y_true = np.concatenate([y[folds[i][1]] for i, _, _ in results])
+    y_pred = np.concatenate([pred for _, pred, _ in results])
+    fold_accuracy = [float((pred == y[folds[i][1]]).mean()) for i, pred, _ in results]
+    precision, recall, f1, support = precision_recall_fscore_support(
+        y_true, y_pred, labels=labels, zero_division=0
+    )
+    report = {
+        'key': key,
+        'params': params,
+        'n_splits': n_splits,
+        'n_repeats': n_repeats,
+        'accuracy_mean': float(np.mean(fold_accuracy)),
+        'accuracy_std': float(np.std(fold_accuracy)),
+        'fold_accuracy': fold_accuracy,
+        'fit_seconds_total': float(sum(seconds for _, _, seconds in results)),
+        'classes': [str(name) for name in class_names],
+        'per_class': {
+            str(name): {
+                'precision': float(precision[i]),
+                'recall': float(recall[i]),
+                'f1': float(f1[i]),
+                'support': int(support[i]),
+            }
+            for i, name in enumerate(class_names)
+        },
+        'confusion_matrix': confusion_matrix(y_true, y_pred, labels=labels).tolist(),
+    }
+    with open(report_path, 'w') as file:
+        json.dump(report, file, indent=2)
+    report['from_cache'] = False
+    return report
+
+
+def render_html(report):
+    classes = report['classes']
+    rows = ''.join(
+        f"<tr><td>{html.escape(name)}</td>"
+        + ''.join(f"<td>{report['per_class'][name][m]:.3f}</td>" for m in ('precision', 'recall', 'f1'))
+        + f"<td>{report['per_class'][name]['support']}</td></tr>"
+        for name in classes
+    )
+    header = ''.join(f'<th>{html.escape(name)}</th>' for name in classes)
+    matrix = ''.join(
+        f"<tr><th>{html.escape(name)}</th>" + ''.join(f'<td>{v}</td>' for v in row) + '</tr>'
+        for name, row in zip(classes, report['confusion_matrix'])
+    )
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Personality model evaluation</title>
+<style>body{{font-family:sans-serif}} td,th{{padding:4px 10px;text-align:right}}</style></head>
+<body>
+<h1>Cross-validated evaluation</h1>
+<p>{report['n_repeats']} x {report['n_splits']}-fold stratified CV, parameters {html.escape(json.dumps(report['params']))}</p>
+<p>Accuracy {report['accuracy_mean'] * 100:.2f}% &plusmn; {report['accuracy_std'] * 100:.2f}</p>
+<h2>Per class</h2>
+<table><tr><th>class</th><th>precision</th><th>recall</th><th>f1</th><th>support</th></tr>{rows}</table>
+<h2>Confusion matrix (rows: true, columns: predicted)</h2>
+<table><tr><th></th>{header}</tr>{matrix}</table>
+</body></html>
+"""
+
+
+def write_report(report, json_path, html_path):
+    with open(json_path, 'w') as file:
+        json.dump(report, file, indent=2)
+    with open(html_path, 'w') as file:
+        file.write(render_html(report))
@@ -0,0 +1,165 @@
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+# File layout: 8-byte magic, little-endian uint64 header length, UTF-8 JSON
+# header, then each array at a 64-byte aligned offset from the file start.
+MAGIC = b"PPFLAT01"
+ALIGNMENT = 64
+FLAT_MODEL_PATH = "personality_prediction.flat"
+LEAF = -1
+
+
+def _estimators(model):
+    # A fitted forest, or a single tree such as the one produced by --compact
+    return list(model.estimators_) if hasattr(model, "estimators_") else [model]
+
+
+def _flatten(model):
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in _estimators(model):
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+        roots.append(offset)
+        features.append(np.where(is_leaf, LEAF, tree.feature).astype(np.int16))
+        thresholds.append(tree.threshold.astype(np.float64))
+        # Leaves point at themselves so traversal can keep stepping harmlessly
+        own = np.arange(tree.node_count) + offset
+        lefts.append(np.where(is_leaf, own, tree.children_left + offset).astype(np.int32))
+        rights.append(np.where(is_leaf, own, tree.children_right + offset).astype(np.int32))
+        value = tree.value[:, 0, :].astype(np.float64)
+        value /= np.maximum(value.sum(axis=1, keepdims=True), 1e-12)
+        values.append(value.astype(np.float32))
+        offset += tree.node_count
+        max_depth = max(max_depth, int(tree.max_depth))
+    arrays = {
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "left": np.concatenate(lefts),
+        "right": np.concatenate(rights),
+        "value": np.concatenate(values),
+        "roots": np.array(roots, dtype=np.int32),
+    }
+    return arrays, max_depth
+
+
+def _aligned(n):
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def export_flat_forest(model, class_names, features, path=FLAT_MODEL_PATH, model_sha256=None,
+                       data_sha256=None, training_key=None):
+    arrays, max_depth = _flatten(model)
+    header = {
+        "format_version": 1,
+        "features": list(features),
+        "classes": [str(name) for name in class_names],
+        "n_trees": int(len(arrays["roots"])),
+        "max_depth": max_depth,
+        "model_sha256": model_sha256,
+        "data_sha256": data_sha256,
+        "training_key": training_key,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "arrays": {},
+    }
+    # Offsets depend on the header size, which depends on the offsets, so lay
+    # the arrays out relative to a generously padded header.
+    placeholder = json.dumps({**header, "arrays": {name: {
+        "dtype": arr.dtype.str, "shape": list(arr.shape), "offset": 10 ** 12}
+        for name, arr in arrays.items()}}).encode()
+    data_start = _aligned(len(MAGIC) + 8 + len(placeholder))
+    position = data_start
+    for name, arr in arrays.items():
+        header["arrays"][name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": position}
+        position = _aligned(position + arr.nbytes)
+    header_bytes = json.dumps(header).encode().ljust(data_start - len(MAGIC) - 8)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<Q", len(header_bytes)))
+        file.write(header_bytes)
+        for name, arr in arrays.items():
+            file.seek(header["arrays"][name]["offset"])
+            file.write(np.ascontiguousarray(arr).tobytes())
+        file.truncate(position)
+    os.replace(tmp_path, path)
+    return header
+
+
+def read_header(path=FLAT_MODEL_PATH):
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{path}' is not a flat forest artifact.")
+        (length,) = struct.unpack("<Q", file.read(8))
+        return json.loads(file.read(length))
+
+
+class FlatForest:
+    """Pure-NumPy evaluator for artifacts written by ``export_flat_forest``."""
+
+    def __init__(self, header, arrays):
+        self.header = header
+        self.features = header["features"]
+        self.classes = np.array(header["classes"])
+        self.max_depth = header["max_depth"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+
+    @classmethod
+    def load(cls, path=FLAT_MODEL_PATH):
+        header = read_header(path)
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"]))
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                         offset=spec["offset"]).reshape(spec["shape"])
+        return cls(header, arrays)
+
+    def _as_matrix(self, X):
+        columns = getattr(X, "columns", None)
+        if columns is not None:
+            X = X[self.features]
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != len(self.features):
+            raise ValueError(f"Expected {len(self.features)} features {self.features}.")
+        return X
+
+    def predict_proba(self, X, chunk_size=4096):
+        X = self._as_matrix(X)
+        out = np.empty((len(X), len(self.classes)), dtype=np.float64)
+        for start in range(0, len(X), chunk_size):
+            out[start : start + chunk_size] = self._predict_chunk(X[start : start + chunk_size])
+        return out
+
+    def _predict_chunk(self, X):
+        # Walk every tree for every row at once: nodes has shape (trees, rows)
+        rows = np.arange(len(X))[None, :]
+        nodes = np.repeat(self.roots[:, None], len(X), axis=1)
+        for _ in range(self.max_depth):
+            feature = self.feature[nodes]
+            split = feature != LEAF
+            if not split.any():
+                break
+            go_left = X[rows, np.where(split, feature, 0)] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes].mean(axis=0)
+
+    def predict(self, X):
+        return self.predict_proba(X).argmax(axis=1)
+
+    def predict_labels(self, X):
+        return self.classes[self.predict(X)]
@@ -0,0 +1,115 @@
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+
+from lookup_table import FEATURES
+
+HISTORY_DB_PATH = os.environ.get("PERSONALITY_HISTORY_DB", os.path.join("data", "history.sqlite3"))
+# Assessments kept in st.session_state; everything older lives only in SQLite
+SESSION_HISTORY_LIMIT = 20
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    day TEXT NOT NULL,
+    trait TEXT NOT NULL,
+    {", ".join(f"{name} INTEGER NOT NULL" for name in FEATURES)}
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_day ON assessments (day);
+CREATE INDEX IF NOT EXISTS idx_assessments_trait_day ON assessments (trait, day);
+"""
+_INSERT = (
+    f"INSERT INTO assessments (created_at, day, trait, {', '.join(FEATURES)}) "
+    f"VALUES ({', '.join('?' * (len(FEATURES) + 3))})"
+)
+
+
+class HistoryStore:
+    """SQLite-backed assessment history shared by every session in the process.
+
+    Writes are queued and committed in batches by a background thread, so
+    ``record`` never waits on disk. Reads use their own short-lived
+    connections, which WAL mode lets run alongside the writer.
+    """
+
+    def __init__(self, path=HISTORY_DB_PATH, batch_size=200, flush_interval=0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record(self, created_at, trait, scores):
+        # created_at is "%Y-%m-%d %H:%M"; scores maps feature name to 1-10 score
+        self._queue.put((created_at, created_at[:10], str(trait), *(int(scores[name]) for name in FEATURES)))
+
+    def flush(self):
+        self._queue.join()
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            rows = [self._queue.get()]
+            try:
+                while len(rows) < self.batch_size:
+                    rows.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                pass
+            try:
+                with conn:
+                    conn.executemany(_INSERT, rows)
+            except sqlite3.Error as exc:
+                print(f"Failed to write {len(rows)} history rows: {exc}")
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
+
+    def _query(self, sql, params=()):
+        with self._connect() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def total(self):
+        return self._query("SELECT COUNT(*) FROM assessments")[0][0]
+
+    def trait_counts(self):
+        return dict(self._query(
+            "SELECT trait, COUNT(*) FROM assessments GROUP BY trait ORDER BY COUNT(*) DESC"
+        ))
+
+    def daily_counts(self, since_day=None):
+        # [(day, trait, count)] aggregated in SQLite, not in Python
+        if since_day is None:
+            return self._query(
+                "SELECT day, trait, COUNT(*) FROM assessments GROUP BY day, trait ORDER BY day"
+            )
+        return self._query(
+            "SELECT day, trait, COUNT(*) FROM assessments WHERE day >= ? "
+            "GROUP BY day, trait ORDER BY day",
+            (since_day,),
+        )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_history_store(path=HISTORY_DB_PATH):
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore(path)
+            atexit.register(_store.flush)
+        return _store
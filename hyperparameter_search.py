@@ -0,0 +1,63 @@
+import itertools
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+
+DEFAULT_GRID = {
+    'n_estimators': [25, 50, 100, 200],
+    'max_depth': [None, 4, 8],
+    'max_features': ['sqrt', 3, None],
+}
+
+
+def expand_grid(grid):
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def _evaluate_candidate(task):
+    index, params, X, y, cv_folds, random_state = task
+    # Every candidate sees the same folds and forest seed, so results don't
+    # depend on which worker picked it up or in what order.
+    folds = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=random_state)
+    scores = []
+    fit_seconds = []
+    for train_idx, test_idx in folds.split(X, y):
+        model = RandomForestClassifier(random_state=random_state, n_jobs=1, **params)
+        start = time.perf_counter()
+        model.fit(X[train_idx], y[train_idx])
+        fit_seconds.append(time.perf_counter() - start)
+        scores.append(float((model.predict(X[test_idx]) == y[test_idx]).mean()))
+
+    model = RandomForestClassifier(random_state=random_state, n_jobs=1, **params).fit(X, y)
+    return {
+        'candidate': index,
+        'params': params,
+        'cv_accuracy': float(np.mean(scores)),
+        'cv_accuracy_std': float(np.std(scores)),
+        'fit_seconds': float(np.mean(fit_seconds)),
+        'model_size_bytes': len(pickle.dumps(model)),
+    }
+
+
+def run_search(X, y, grid=DEFAULT_GRID, cv_folds=5, random_state=42, n_jobs=-1):
+    X = np.asarray(X)
+    y = np.asarray(y)
+    workers = os.cpu_count() if n_jobs in (None, -1) else max(1, n_jobs)
+    tasks = [(i, params, X, y, cv_folds, random_state) for i, params in enumerate(expand_grid(grid))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_evaluate_candidate, tasks))
+    # Best accuracy first; smaller and faster models win ties
+    results.sort(key=lambda r: (-r['cv_accuracy'], r['model_size_bytes'], r['fit_seconds'], r['candidate']))
+    return results
+
+
+def write_results(results, path):
+    rows = [{**{k: v for k, v in r.items() if k != 'params'}, **r['params']} for r in results]
+    pd.DataFrame(rows).to_csv(path, index=False)
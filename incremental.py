@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+STATE_PATH = 'training_state.json'
+INCREMENTAL_LOG_PATH = 'incremental_log.csv'
+# Labelled rows kept per class so every batch of new trees sees every class
+REPLAY_ROWS_PER_CLASS = 20
+
+
+def hash_rows(path, n_rows):
+    # Hash the header plus the first n data lines, i.e. the rows already trained on
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for _ in range(n_rows + 1):
+            line = file.readline()
+            if not line:
+                break
+            digest.update(line)
+    return digest.hexdigest()
+
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def save_state(state, path=STATE_PATH):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump(state, file, indent=2)
+    os.replace(tmp_path, path)
+
+
+def make_state(data_path, rows, X, y, feature_columns, random_state=42):
+    return {
+        'rows': int(rows),
+        'prefix_sha256': hash_rows(data_path, rows),
+        'feature_columns': list(feature_columns),
+        'replay': replay_buffer(np.asarray(X), np.asarray(y), random_state),
+        'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def replay_buffer(X, y, random_state=42, per_class=REPLAY_ROWS_PER_CLASS):
+    rng = np.random.default_rng(random_state)
+    rows = []
+    for label in np.unique(y):
+        idx = np.flatnonzero(y == label)
+        keep = rng.choice(idx, size=min(per_class, len(idx)), replace=False)
+        rows += [[*map(int, X[i]), int(label)] for i in sorted(keep)]
+    return rows
+
+
+def read_new_rows(data_path, state):
+    # Returns None when the already-trained prefix was edited, which rules out
+    # an incremental update.
+    if hash_rows(data_path, state['rows']) != state['prefix_sha256']:
+        return None
+    return pd.read_csv(data_path, skiprows=range(1, state['rows'] + 1))
+
+
+def warm_start_update(model, X_new, y_new, state, new_trees, max_trees=None, random_state=42):
+    replay = np.array(state['replay'], dtype=np.int64)
+    X = np.vstack([np.asarray(X_new, dtype=np.int64), replay[:, :-1]])
+    y = np.concatenate([np.asarray(y_new, dtype=np.int64), replay[:, -1]])
+    X = pd.DataFrame(X, columns=state['feature_columns'])
+
+    # OOB scoring would mix the old trees' bootstrap samples with the new rows
+    model.set_params(warm_start=True, oob_score=False,
+                     n_estimators=len(model.estimators_) + new_trees)
+    model.fit(X, y)
+    model.set_params(warm_start=False)
+    for attr in ('oob_score_', 'oob_decision_function_'):
+        if hasattr(model, attr):
+            delattr(model, attr)
+
+    if max_trees is not None and len(model.estimators_) > max_trees:
+        # Refresh: retire the oldest trees so the forest stays a fixed size
+        model.estimators_ = model.estimators_[-max_trees:]
+        model.n_estimators = max_trees
+
+    state['replay'] = replay_buffer(X.to_numpy(), y, random_state + len(model.estimators_))
+    return model
+
+
+def log_timing(entry, path=INCREMENTAL_LOG_PATH):
+    pd.DataFrame([entry]).to_csv(path, mode='a', header=not os.path.exists(path), index=False)
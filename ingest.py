@@ -0,0 +1,150 @@
+import json
+import os
+import shutil
+import time
+import tracemalloc
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from lookup_table import FEATURES, check_input_range
+
+CACHE_DIR = os.path.join('.cache', 'columnar')
+# Everything model.py can train on; any other CSV columns are never parsed
+INGEST_COLUMNS = ['Gender', 'Age', *FEATURES, 'Personality']
+CATEGORICAL_COLUMNS = ['Gender', 'Personality']
+CHUNK_ROWS = 250_000
+
+
+class ColumnarData(NamedTuple):
+    columns: Dict[str, np.ndarray]  # read-only uint8 memmaps, in CSV column order
+    categories: Dict[str, List[str]]  # code -> value for categorical columns
+    rows: int
+    stats: dict
+
+
+def _traced(func):
+    # (result, seconds, peak traced bytes); nested tracing leaves the outer one running
+    tracing = not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    else:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        result = func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _codes(column, categories, fixed):
+    # Maps one chunk of a categorical column onto codes that are stable across chunks
+    if fixed is not None:
+        codes = column.astype(object).map(fixed)
+        if codes.isna().any():
+            unknown = sorted(set(column[codes.isna()].astype(str)))
+            raise ValueError(f"Unknown {column.name} values {unknown}; expected one of {sorted(fixed)}.")
+        return codes.to_numpy(dtype=np.uint8)
+    for value in column.cat.categories:
+        if value not in categories:
+            categories.append(value)
+    if len(categories) > 256:
+        raise ValueError(f"Column {column.name} has more than 256 distinct values.")
+    lookup = np.array([categories.index(value) for value in column.cat.categories], dtype=np.uint8)
+    if column.isna().any():
+        raise ValueError(f"Column {column.name} has missing values.")
+    return lookup[column.cat.codes.to_numpy()]
+
+
+def convert_csv(path, entry, category_codes=None, chunk_rows=CHUNK_ROWS, columns_to_drop=()):
+    # Streams the CSV once, column by column into raw uint8 files, so memory
+    # stays at one chunk regardless of the file size. Numeric columns are
+    # parsed wide and range-checked before narrowing, never wrapped; dropped
+    # columns are never parsed at all.
+    category_codes = category_codes or {}
+    header = pd.read_csv(path, nrows=0).columns
+    names = [name for name in header if name in INGEST_COLUMNS and name not in columns_to_drop]
+    dtype = {name: 'category' if name in CATEGORICAL_COLUMNS else np.int64 for name in names}
+    categories = {name: [] for name in names if name in CATEGORICAL_COLUMNS}
+
+    tmp_entry = entry + '.tmp'
+    shutil.rmtree(tmp_entry, ignore_errors=True)
+    os.makedirs(tmp_entry)
+    files = {name: open(os.path.join(tmp_entry, f'{name}.u8'), 'wb') for name in names}
+    rows = 0
+    try:
+        for chunk in pd.read_csv(path, usecols=names, dtype=dtype, chunksize=chunk_rows):
+            for name in names:
+                if name in categories:
+                    values = _codes(chunk[name], categories[name], category_codes.get(name))
+                else:
+                    values = check_input_range(name, chunk[name].to_numpy(), chunk.index)
+                files[name].write(values.tobytes())
+            rows += len(chunk)
+    finally:
+        for file in files.values():
+            file.close()
+
+    for name, fixed in category_codes.items():
+        if name in categories:
+            categories[name] = sorted(fixed, key=fixed.get)
+    meta = {'rows': rows, 'columns': names, 'categories': {k: [str(v) for v in c] for k, c in categories.items()}}
+    with open(os.path.join(tmp_entry, 'meta.json'), 'w') as file:
+        json.dump(meta, file, indent=2)
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(tmp_entry, entry)
+    return meta
+
+
+def open_columns(entry):
+    with open(os.path.join(entry, 'meta.json')) as file:
+        meta = json.load(file)
+    columns = {}
+    for name in meta['columns']:
+        path = os.path.join(entry, f'{name}.u8')
+        # np.memmap refuses zero-length files
+        columns[name] = (np.memmap(path, dtype=np.uint8, mode='r', shape=(meta['rows'],))
+                         if meta['rows'] else np.empty(0, dtype=np.uint8))
+    return meta, columns
+
+
+def cache_entry(data_sha256, columns_to_drop=(), cache_dir=CACHE_DIR):
+    # One entry per data version and set of dropped columns
+    dropped = sorted(set(columns_to_drop) & set(INGEST_COLUMNS))
+    name = data_sha256[:16] + ''.join(f'-no-{column}' for column in dropped)
+    return os.path.join(cache_dir, name)
+
+
+def load_columnar(path, data_sha256, category_codes=None, cache_dir=CACHE_DIR,
+                  chunk_rows=CHUNK_ROWS, refresh=False, columns_to_drop=()):
+    entry = cache_entry(data_sha256, columns_to_drop, cache_dir)
+    stats = {'from_cache': True, 'convert_seconds': 0.0, 'convert_peak_bytes': 0}
+    if refresh or not os.path.exists(os.path.join(entry, 'meta.json')):
+        os.makedirs(cache_dir, exist_ok=True)
+        _, seconds, peak = _traced(
+            lambda: convert_csv(path, entry, category_codes, chunk_rows, columns_to_drop))
+        stats.update(from_cache=False, convert_seconds=seconds, convert_peak_bytes=peak)
+
+    (meta, columns), seconds, peak = _traced(lambda: open_columns(entry))
+    stats.update(
+        load_seconds=seconds,
+        load_peak_bytes=peak,
+        cache_bytes=sum(column.nbytes for column in columns.values()),
+    )
+    return ColumnarData(columns, meta['categories'], meta['rows'], stats)
+
+
+def describe(stats):
+    parts = []
+    if not stats['from_cache']:
+        parts.append(f"converted CSV in {stats['convert_seconds']:.2f}s "
+                     f"(peak {stats['convert_peak_bytes'] / 2 ** 20:.1f} MiB)")
+    parts.append(f"mapped columnar cache in {stats['load_seconds'] * 1000:.1f} ms "
+                 f"(peak {stats['load_peak_bytes'] / 1024:.0f} KiB, "
+                 f"{stats['cache_bytes'] / 1024:.0f} KiB of uint8 columns)")
+    return '; '.join(parts)
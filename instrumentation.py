@@ -0,0 +1,158 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Set PERSONALITY_METRICS=1 to turn the hooks on; when off, every hook is a
+# shared no-op context manager.
+METRICS_ENABLED = os.environ.get("PERSONALITY_METRICS", "") not in ("", "0")
+METRICS_PORT = int(os.environ.get("PERSONALITY_METRICS_PORT", "9464"))
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_NULL_CONTEXT = nullcontext()
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def observe(self, name, value_ms):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(value_ms)
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def register_gauge(self, name, read):
+        # read() is called at scrape time, e.g. to report lru_cache statistics
+        self._gauges[name] = read
+
+    def snapshot(self):
+        with self._lock:
+            stages = {
+                name: {
+                    "count": h.count,
+                    "mean_ms": h.total / h.count if h.count else 0.0,
+                    "p50_ms": h.quantile(0.5),
+                    "p99_ms": h.quantile(0.99),
+                }
+                for name, h in self._histograms.items()
+            }
+            counters = dict(self._counters)
+        counters.update({name: read() for name, read in self._gauges.items()})
+        return {"stages": stages, "counters": counters}
+
+    def render_prometheus(self):
+        lines = [
+            "# HELP personality_stage_ms Time spent per prediction-path stage in milliseconds.",
+            "# TYPE personality_stage_ms histogram",
+        ]
+        with self._lock:
+            for name, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'personality_stage_ms_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'personality_stage_ms_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'personality_stage_ms_sum{{stage="{name}"}} {h.total}')
+                lines.append(f'personality_stage_ms_count{{stage="{name}"}} {h.count}')
+            counters = dict(self._counters)
+        lines.append("# TYPE personality_events_total counter")
+        for name, value in sorted(counters.items()):
+            lines.append(f'personality_events_total{{event="{name}"}} {value}')
+        # Registered readings can go down (e.g. sessions held), so they are
+        # gauges; rate() over a counter that drops would read it as a reset.
+        lines.append("# TYPE personality_gauge gauge")
+        for name, read in sorted(self._gauges.items()):
+            lines.append(f'personality_gauge{{name="{name}"}} {read()}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+_server = None
+_server_lock = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=METRICS_PORT, host="127.0.0.1"):
+    # Safe to call on every Streamlit rerun: only the first call binds the port
+    global _server
+    with _server_lock:
+        if _server is None and metrics.enabled:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as exc:
+                print(f"Metrics endpoint not started on port {port}: {exc}")
+                _server = False
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+            print(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+        return _server or None
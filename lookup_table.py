@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from model_registry import MODEL_PATH, file_sha256, load_pickle
+
+# Feature order used for training (CSV column order minus the dropped columns)
+FEATURES = [
+    "openness",
+    "neuroticism",
+    "conscientiousness",
+    "agreeableness",
+    "extraversion",
+]
+SCORE_MIN = 1
+SCORE_MAX = 10
+LEVELS = SCORE_MAX - SCORE_MIN + 1
+TABLE_SIZE = LEVELS ** len(FEATURES)
+# Accepted values of the numeric input columns; Age only appears in variants
+INPUT_RANGES = {**{name: (SCORE_MIN, SCORE_MAX) for name in FEATURES}, "Age": (0, 120)}
+
+# The table array followed by its metadata (UTF-8 JSON as a uint8 array), two
+# records in one .npy file so they are always replaced together.
+TABLE_PATH = "personality_prediction_table.npy"
+
+# Place value of each feature in the flat table index, most significant first
+_STRIDES = LEVELS ** np.arange(len(FEATURES) - 1, -1, -1)
+
+
+def table_dtype(n_classes):
+    return np.dtype([("label", np.uint8), ("proba", np.float32, (n_classes,))])
+
+
+def full_input_space():
+    # Row i of the result holds the scores whose table index is i
+    grid = np.indices((LEVELS,) * len(FEATURES), dtype=np.uint8)
+    return grid.reshape(len(FEATURES), -1).T + SCORE_MIN
+
+
+def score_index(scores):
+    scores = np.asarray(scores, dtype=np.int64)
+    if scores.shape[-1] != len(FEATURES):
+        raise ValueError(f"Expected {len(FEATURES)} scores, got {scores.shape[-1]}.")
+    if scores.min() < SCORE_MIN or scores.max() > SCORE_MAX:
+        raise ValueError(f"Scores must be between {SCORE_MIN} and {SCORE_MAX}.")
+    return (scores - SCORE_MIN) @ _STRIDES
+
+
+def check_input_range(name, values, index=None):
+    # CSV columns are parsed as int64 and narrowed here: reading them straight
+    # into uint8 would silently turn 256 into 0 and -1 into 255.
+    low, high = INPUT_RANGES[name]
+    values = np.asarray(values)
+    bad = np.flatnonzero((values < low) | (values > high))
+    if len(bad):
+        rows = bad if index is None else np.asarray(index)[bad]
+        shown = ", ".join(str(row) for row in rows[:5]) + (", ..." if len(rows) > 5 else "")
+        raise ValueError(f"{name} must be between {low} and {high}; got {values[bad[0]]} "
+                         f"(data rows {shown}).")
+    return values.astype(np.uint8)
+
+
+def _model_proba(model, X):
+    import pandas as pd
+
+    return model.predict_proba(pd.DataFrame(X, columns=FEATURES))
+
+
+def build_table(model, batch_size=20_000):
+    X = full_input_space()
+    table = np.empty(len(X), dtype=table_dtype(len(model.classes_)))
+    for start in range(0, len(X), batch_size):
+        proba = _model_proba(model, X[start : start + batch_size])
+        # Take the argmax in float64 so ties resolve exactly like model.predict.
+        # Labels index the probability columns, i.e. model.classes_.
+        table["label"][start : start + batch_size] = proba.argmax(axis=1)
+        table["proba"][start : start + batch_size] = proba
+    return table
+
+
+def save_table(table, classes, model_sha256, path=TABLE_PATH):
+    meta = {
+        "features": FEATURES,
+        "score_range": [SCORE_MIN, SCORE_MAX],
+        "classes": [str(c) for c in classes],
+        "model_sha256": model_sha256,
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        np.save(file, table)
+        np.save(file, np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8))
+    os.replace(tmp_path, path)
+
+
+def load_table(path=TABLE_PATH):
+    table = np.load(path, mmap_mode="r")
+    with open(path, "rb") as file:
+        file.seek(table.offset + table.nbytes)
+        try:
+            meta = json.loads(np.load(file).tobytes())
+        except EOFError:
+            raise ValueError(f"'{path}' has no embedded metadata; rebuild it with lookup_table.py.")
+    if len(table) != TABLE_SIZE or meta["features"] != FEATURES:
+        raise ValueError(f"'{path}' does not match the expected input space.")
+    return table, meta
+
+
+def verify_table(model, table, batch_size=20_000):
+    X = full_input_space()
+    mismatches = 0
+    max_proba_error = 0.0
+    for start in range(0, len(X), batch_size):
+        proba = _model_proba(model, X[start : start + batch_size])
+        predicted = model.classes_[proba.argmax(axis=1)]
+        rows = table[start : start + batch_size]
+        mismatches += int(np.count_nonzero(model.classes_[rows["label"]] != predicted))
+        max_proba_error = max(max_proba_error, float(np.abs(rows["proba"] - proba).max()))
+    return mismatches, max_proba_error
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build or verify the precomputed prediction table for the 1-10 score space."
+    )
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--table", default=TABLE_PATH)
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check the existing table against model.predict for every input.",
+    )
+    args = parser.parse_args(argv)
+
+    payload = load_pickle(args.model)
+    model = payload["model"]
+
+    if args.verify:
+        table, meta = load_table(args.table)
+        if meta["model_sha256"] != file_sha256(args.model):
+            print(f"Warning: '{args.table}' was built from a different model file.")
+        mismatches, max_error = verify_table(model, table)
+        print(f"Checked {len(table)} inputs: {mismatches} label mismatches, "
+              f"max probability error {max_error:.2e}.")
+        return 1 if mismatches else 0
+
+    table = build_table(model)
+    save_table(table, payload["label_encoder"].classes_[model.classes_], file_sha256(args.model), args.table)
+    print(f"Saved {len(table)}-entry lookup table to '{args.table}' "
+          f"({table.nbytes / 1024:.0f} KiB).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,76 +1,355 @@
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score
+import argparse
+import hashlib
 import pickle
 import os
+import time
 
-print("Model training script started.")
-
-# Create data directory if it doesn't exist
-if not os.path.exists('data'):
-    os.makedirs('data')
-    print("Created 'data' directory.")
-
-# Load the dataset
-try:
-    data = pd.read_csv('data/personality_prediction.csv')
-    print("Dataset loaded successfully.")
-    print("Dataset head:\n", data.head())
-except FileNotFoundError:
-    print("Error: 'data/personality_prediction.csv' not found.")
-    print("Please make sure the CSV file is in the 'data' directory.")
-    exit()
-
-# Drop unnecessary columns if they exist
-columns_to_drop = ['Gender', 'Age']
-data = data.drop(columns=[col for col in columns_to_drop if col in data.columns])
-print("Dropped unnecessary columns.")
-
-# Encode the target variable 'Personality'
-le = LabelEncoder()
-data['Personality'] = le.fit_transform(data['Personality'])
-print("Target variable 'Personality' encoded.")
-print("Encoded classes:", list(le.classes_))
-
-# Define features (X) and target (y)
-X = data.drop('Personality', axis=1)
-y = data['Personality']
-
-print("Features (X) shape:", X.shape)
-print("Target (y) shape:", y.shape)
-
-# Split data into training and testing sets
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-print("Data split into training and testing sets.")
-print("Training set size:", X_train.shape[0])
-print("Testing set size:", X_test.shape[0])
-
-# Initialize and train the RandomForestClassifier
-model = RandomForestClassifier(n_estimators=100, random_state=42, oob_score=True)
-print("Training RandomForestClassifier model...")
-model.fit(X_train, y_train)
-print("Model training completed.")
-
-# Make predictions on the test set
-y_pred = model.predict(X_test)
-
-# Evaluate the model
-accuracy = accuracy_score(y_test, y_pred)
-print(f"Model Accuracy: {accuracy * 100:.2f}%")
-if hasattr(model, 'oob_score_'):
-    print(f"Out-of-Bag Score: {model.oob_score_ * 100:.2f}%")
-
-
-# Save the trained model and the label encoder to a file
-model_payload = {
-    'model': model,
-    'label_encoder': le
-}
-
-with open('personality_prediction.pkl', 'wb') as file:
-    pickle.dump(model_payload, file)
-
-print("Trained model and label encoder saved to 'personality_prediction.pkl'.")
-print("Model training script finished.")
+from compaction import compact_model, print_comparison
+from evaluation import evaluate, write_report
+from flat_forest import FLAT_MODEL_PATH, export_flat_forest
+from hyperparameter_search import DEFAULT_GRID, run_search, write_results
+from ingest import describe, load_columnar
+from incremental import (STATE_PATH, hash_rows, load_state, log_timing, make_state, read_new_rows,
+                         save_state, warm_start_update)
+from lookup_table import FEATURES, TABLE_PATH, build_table, save_table
+from model_registry import file_sha256
+from model_router import CATEGORY_CODES, register_variant, variant_path
+from training_cache import live_key, restore, store, training_key
+
+DATA_PATH = 'data/personality_prediction.csv'
+MODEL_PATH = 'personality_prediction.pkl'
+COLUMNS_TO_DROP = ['Gender', 'Age']
+RANDOM_STATE = 42
+CACHED_ARTIFACTS = [MODEL_PATH, FLAT_MODEL_PATH, TABLE_PATH, STATE_PATH]
+DEFAULT_PARAMS = {'n_estimators': 100}
+
+
+def load_dataset(path=DATA_PATH, refresh=False, columns_to_drop=COLUMNS_TO_DROP):
+    # Create data directory if it doesn't exist
+    if not os.path.exists('data'):
+        os.makedirs('data')
+        print("Created 'data' directory.")
+
+    # The CSV is converted once, in chunks, to memory-mapped uint8 columns
+    # (categoricals as codes) and training reads from those afterwards.
+    # Dropped columns are never parsed, so blanks in them don't matter.
+    try:
+        data = load_columnar(path, file_sha256(path), CATEGORY_CODES, refresh=refresh,
+                             columns_to_drop=columns_to_drop)
+        print(f"Dataset loaded successfully: {data.rows} rows; {describe(data.stats)}.")
+    except FileNotFoundError:
+        print(f"Error: '{path}' not found.")
+        print("Please make sure the CSV file is in the 'data' directory.")
+        exit()
+    except ValueError as exc:
+        print(f"Error: '{path}' could not be read as survey data: {exc}")
+        exit()
+    return data
+
+
+def prepare_features(data, columns_to_drop=COLUMNS_TO_DROP):
+    # Drop unnecessary columns if they exist; Gender, when kept for an A/B
+    # variant, is already encoded numerically by the ingestion stage.
+    features = [col for col in data.columns if col != 'Personality' and col not in columns_to_drop]
+    print("Dropped unnecessary columns.")
+
+    # Encode the target variable 'Personality' the way LabelEncoder does
+    # (sorted class names) by relabelling the stored category codes.
+    le = LabelEncoder()
+    le.classes_ = np.array(sorted(data.categories['Personality']), dtype=object)
+    relabel = np.array([list(le.classes_).index(name) for name in data.categories['Personality']],
+                       dtype=np.intp)
+    print("Target variable 'Personality' encoded.")
+    print("Encoded classes:", list(le.classes_))
+
+    # Define features (X) and target (y); uint8 throughout
+    X = pd.DataFrame({col: data.columns[col] for col in features})
+    y = pd.Series(relabel[data.columns['Personality']], name='Personality')
+
+    print("Features (X) shape:", X.shape)
+    print("Target (y) shape:", y.shape)
+    return X, y, le
+
+
+def train_model(X_train, y_train, params=None, n_jobs=-1):
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    model = RandomForestClassifier(random_state=RANDOM_STATE, oob_score=True, n_jobs=n_jobs, **params)
+    print(f"Training RandomForestClassifier model with {params}...")
+    model.fit(X_train, y_train)
+    print("Model training completed.")
+    return model
+
+
+def save_payload(model, le, path=MODEL_PATH, data_sha256=None, training_key=None):
+    # Save the trained model and the label encoder to a file, tagged with the
+    # data version and training cache key they were built from
+    model_payload = {
+        'model': model,
+        'label_encoder': le,
+        'data_sha256': data_sha256,
+        'training_key': training_key,
+    }
+
+    # Serving predicts a row at a time, and a pickled n_jobs=-1 would start a
+    # joblib pool over every core on each call. Training keeps its own n_jobs.
+    n_jobs = getattr(model, 'n_jobs', None)
+    if n_jobs is not None:
+        model.n_jobs = None
+
+    # Write then rename so a running app.py never sees a half-written file
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(model_payload, file)
+    finally:
+        if n_jobs is not None:
+            model.n_jobs = n_jobs
+    os.replace(tmp_path, path)
+
+    print(f"Trained model and label encoder saved to '{path}'.")
+
+
+def write_artifacts(model, le, data_path, training_key=None):
+    data_sha256 = file_sha256(data_path)
+    save_payload(model, le, data_sha256=data_sha256, training_key=training_key)
+
+    # Pickle-free copy of the same model for fast, scikit-learn-free loading
+    export_flat_forest(model, le.classes_[model.classes_], FEATURES, FLAT_MODEL_PATH,
+                       model_sha256=file_sha256(MODEL_PATH), data_sha256=data_sha256,
+                       training_key=training_key)
+    print(f"Flat model artifact saved to '{FLAT_MODEL_PATH}'.")
+
+    # Precompute every answer for the 1-10 slider space so the app can skip the forest
+    print("Building prediction lookup table...")
+    table = build_table(model)
+    save_table(table, le.classes_[model.classes_], file_sha256(MODEL_PATH))
+    print(f"Lookup table with {len(table)} entries saved to '{TABLE_PATH}'.")
+
+
+def write_variant(model, le, features, name, data_path, weight, training_key=None):
+    # Variants are served by name or traffic share through model_router; only
+    # the memory-mapped flat artifact is written for them.
+    path = variant_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    export_flat_forest(model, le.classes_[model.classes_], features, path,
+                       data_sha256=file_sha256(data_path), training_key=training_key)
+    register_variant(name, path, weight)
+    print(f"Model variant '{name}' with features {list(features)} saved to '{path}' "
+          f"(traffic weight {weight}).")
+
+
+def train_incremental(args):
+    # Returns False when only a full retrain can produce a correct model
+    state = load_state()
+    if state is None or not os.path.exists(MODEL_PATH):
+        print("No previous training state found; running a full retrain.")
+        return False
+    with open(MODEL_PATH, 'rb') as file:
+        payload = pickle.load(file)
+    model, le = payload['model'], payload['label_encoder']
+    if not isinstance(model, RandomForestClassifier):
+        print("Saved model is not a random forest (compacted?); running a full retrain.")
+        return False
+    # Saved models carry n_jobs=None for serving; the new trees use --n-jobs
+    model.n_jobs = args.n_jobs
+
+    new_rows = read_new_rows(args.data, state)
+    if new_rows is None:
+        print("Previously trained rows have changed; running a full retrain.")
+        return False
+    if new_rows.empty:
+        print(f"No new rows since the last run (watermark: {state['rows']} rows).")
+        return True
+
+    unknown = set(new_rows['Personality']) - set(le.classes_)
+    if unknown:
+        print(f"New personality classes {sorted(unknown)}; running a full retrain.")
+        return False
+
+    new_rows = new_rows.drop(columns=[col for col in COLUMNS_TO_DROP if col in new_rows.columns])
+    X_new = new_rows[state['feature_columns']]
+    y_new = le.transform(new_rows['Personality'])
+    print(f"Ingesting {len(new_rows)} new rows after the watermark of {state['rows']}.")
+
+    start = time.perf_counter()
+    model = warm_start_update(model, X_new, y_new, state, args.new_trees, args.max_trees, RANDOM_STATE)
+    incremental_seconds = time.perf_counter() - start
+    print(f"Added {args.new_trees} trees in {incremental_seconds:.2f}s "
+          f"(forest now has {len(model.estimators_)} trees).")
+
+    total_rows = state['rows'] + len(new_rows)
+    entry = {'total_rows': total_rows, 'new_rows': len(new_rows),
+             'incremental_seconds': incremental_seconds}
+    if args.compare_full:
+        data = load_dataset(args.data)
+        X, y, _ = prepare_features(data)
+        start = time.perf_counter()
+        train_model(X, y, n_jobs=args.n_jobs)
+        entry['full_seconds'] = time.perf_counter() - start
+        print(f"Full retrain on {total_rows} rows took {entry['full_seconds']:.2f}s; incremental "
+              f"saved {entry['full_seconds'] - incremental_seconds:.2f}s.")
+    log_timing(entry)
+
+    # Not reproducible from the data alone, so it never goes into the training cache
+    derived_key = hashlib.sha256(
+        f"{payload.get('training_key')}+{file_sha256(args.data)}+{args.new_trees}+{args.max_trees}".encode()
+    ).hexdigest()
+    write_artifacts(model, le, args.data, training_key=derived_key)
+    state['rows'] = total_rows
+    state['prefix_sha256'] = hash_rows(args.data, total_rows)
+    state['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+    save_state(state)
+    return True
+
+
+def run_evaluation(args):
+    data = load_dataset(args.data, refresh=args.refresh_data_cache, columns_to_drop=args.columns_to_drop)
+    X, y, le = prepare_features(data, args.columns_to_drop)
+    print(f"Evaluating with {args.cv_repeats} x {args.cv_folds}-fold stratified CV...")
+    start = time.perf_counter()
+    report = evaluate(X, y, le.classes_, file_sha256(args.data), DEFAULT_PARAMS,
+                      n_splits=args.cv_folds, n_repeats=args.cv_repeats,
+                      random_state=RANDOM_STATE, n_jobs=args.n_jobs)
+    elapsed = time.perf_counter() - start
+    write_report(report, args.report + '.json', args.report + '.html')
+    print(f"Accuracy {report['accuracy_mean'] * 100:.2f}% +/- {report['accuracy_std'] * 100:.2f} "
+          f"({'cached' if report['from_cache'] else 'computed'} in {elapsed:.2f}s).")
+    print(f"Reports saved to '{args.report}.json' and '{args.report}.html'.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the personality prediction model.")
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--n-jobs', type=int, default=-1,
+                        help="Cores used for fitting (-1 uses all of them).")
+    parser.add_argument('--search', action='store_true',
+                        help="Cross-validated search over n_estimators, max_depth and max_features.")
+    parser.add_argument('--cv-folds', type=int, default=5)
+    parser.add_argument('--search-results', default='search_results.csv')
+    parser.add_argument('--compact', action='store_true',
+                        help="Replace the forest with the smallest, fastest model within the accuracy budget.")
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.02,
+                        help="Largest held-out accuracy loss --compact may accept (0.02 = 2 points).")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Warm-start new trees on rows added since the last run.")
+    parser.add_argument('--new-trees', type=int, default=10,
+                        help="Trees added per --incremental run.")
+    parser.add_argument('--max-trees', type=int, default=None,
+                        help="Drop the oldest trees beyond this forest size after --incremental.")
+    parser.add_argument('--compare-full', action='store_true',
+                        help="Also time a full retrain and log both to incremental_log.csv.")
+    parser.add_argument('--evaluate', action='store_true',
+                        help="Repeated stratified k-fold report (cached on disk) instead of training.")
+    parser.add_argument('--cv-repeats', type=int, default=3)
+    parser.add_argument('--report', default='evaluation_report',
+                        help="Path prefix for the --evaluate .json and .html reports.")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Retrain even if the training cache has artifacts for this data and settings.")
+    parser.add_argument('--refresh-data-cache', action='store_true',
+                        help="Rebuild the columnar copy of the CSV under .cache/columnar.")
+    parser.add_argument('--keep-columns', nargs='+', choices=COLUMNS_TO_DROP, default=[],
+                        help="Train on columns that are dropped by default (requires --variant).")
+    parser.add_argument('--variant',
+                        help="Save the model as a named A/B variant under models/ instead of "
+                             "replacing the default model.")
+    parser.add_argument('--weight', type=float, default=0.0,
+                        help="Share of traffic routed to --variant (relative to the other models).")
+    args = parser.parse_args(argv)
+    args.columns_to_drop = [col for col in COLUMNS_TO_DROP if col not in args.keep_columns]
+    if args.keep_columns and not args.variant and not args.evaluate:
+        parser.error("--keep-columns changes the model's inputs; use it with --variant.")
+    if args.variant and (args.incremental or args.compact):
+        parser.error("--variant cannot be combined with --incremental or --compact.")
+
+    if args.evaluate:
+        run_evaluation(args)
+        return
+
+    print("Model training script started.")
+
+    if args.incremental and train_incremental(args):
+        print("Model training script finished.")
+        return
+
+    # Content-addressed cache: identical data, settings and library versions
+    # always produce identical artifacts, so skip straight to them.
+    key = None
+    if os.path.exists(args.data):
+        key = training_key(file_sha256(args.data), args.columns_to_drop, {
+            'params': DEFAULT_PARAMS,
+            'random_state': RANDOM_STATE,
+            'test_size': 0.2,
+            'search': args.search and {'grid': DEFAULT_GRID, 'cv_folds': args.cv_folds},
+            'compact': args.compact and {'max_accuracy_drop': args.max_accuracy_drop},
+        })
+    if key is not None and not args.no_cache and args.variant:
+        if live_key(variant_path(args.variant)) == key:
+            register_variant(args.variant, variant_path(args.variant), args.weight)
+            print(f"Variant '{args.variant}' is already up to date (training key {key[:12]}).")
+            return
+    elif key is not None and not args.no_cache:
+        if live_key(FLAT_MODEL_PATH) == key:
+            print(f"Artifacts are already up to date (training key {key[:12]}); nothing to do.")
+            return
+        if restore(key, CACHED_ARTIFACTS):
+            print(f"Restored artifacts for training key {key[:12]} from the training cache.")
+            print("Model training script finished.")
+            return
+
+    data = load_dataset(args.data, refresh=args.refresh_data_cache, columns_to_drop=args.columns_to_drop)
+    X, y, le = prepare_features(data, args.columns_to_drop)
+
+    # Split data into training and testing sets
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=RANDOM_STATE)
+    print("Data split into training and testing sets.")
+    print("Training set size:", X_train.shape[0])
+    print("Testing set size:", X_test.shape[0])
+
+    params = None
+    if args.search:
+        print("Running cross-validated hyperparameter search...")
+        results = run_search(X_train, y_train, DEFAULT_GRID, cv_folds=args.cv_folds,
+                             random_state=RANDOM_STATE, n_jobs=args.n_jobs)
+        write_results(results, args.search_results)
+        print(f"Search results for {len(results)} candidates saved to '{args.search_results}'.")
+        params = results[0]['params']
+        print(f"Best parameters: {params} (CV accuracy {results[0]['cv_accuracy'] * 100:.2f}%)")
+
+    model = train_model(X_train, y_train, params, n_jobs=args.n_jobs)
+
+    # Make predictions on the test set
+    y_pred = model.predict(X_test)
+
+    # Evaluate the model
+    accuracy = accuracy_score(y_test, y_pred)
+    print(f"Model Accuracy: {accuracy * 100:.2f}%")
+    if hasattr(model, 'oob_score_'):
+        print(f"Out-of-Bag Score: {model.oob_score_ * 100:.2f}%")
+
+    if args.compact:
+        print(f"Compacting model (max accuracy drop {args.max_accuracy_drop * 100:.1f} points)...")
+        name, model, before, after = compact_model(model, X_train, y_train, X_test, y_test,
+                                                   args.max_accuracy_drop, RANDOM_STATE)
+        print(f"Selected compact model: {name}")
+        print_comparison(before, after)
+
+    if args.variant:
+        write_variant(model, le, X.columns, args.variant, args.data, args.weight, training_key=key)
+        print("Model training script finished.")
+        return
+
+    write_artifacts(model, le, args.data, training_key=key)
+    save_state(make_state(args.data, data.rows, X, y, X.columns, RANDOM_STATE))
+    if key is not None:
+        print(f"Artifacts cached under training key {key[:12]} in '{store(key, CACHED_ARTIFACTS)}'.")
+    print("Model training script finished.")
+
+
+if __name__ == '__main__':
+    main()
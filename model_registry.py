@@ -0,0 +1,128 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Optional
+
+from instrumentation import metrics
+
+MODEL_PATH = "personality_prediction.pkl"
+
+
+@dataclass(frozen=True)
+class LoadedArtifact:
+    value: Any
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    load_seconds: float
+    memory_bytes: int  # growth in process RSS across the load, approximate
+    loaded_at: float
+
+
+def load_pickle(path):
+    with open(path, "rb") as file:
+        return pickle.load(file)
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _rss_bytes():
+    # Resident set size from /proc; 0 where that isn't available
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _measured_load(loader, path):
+    # tracemalloc is process-global and slows every allocation in every
+    # thread while it runs, so the footprint is read off the RSS instead.
+    # Other threads allocating meanwhile can skew it either way.
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    value = loader(path)
+    elapsed = time.perf_counter() - start
+    return value, elapsed, max(0, _rss_bytes() - rss_before)
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded artifacts, shared read-only by all sessions.
+
+    An artifact is reloaded only when its file changes: a cheap ``os.stat``
+    check runs on every ``get`` and the SHA-256 is only recomputed when the
+    mtime or size moved, so a plain ``touch`` does not trigger a reload.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, LoadedArtifact] = {}
+
+    def get(self, path=MODEL_PATH, loader: Callable[[str], Any] = load_pickle):
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if entry is not None and _unchanged(entry, stat):
+            metrics.count("registry_hit")
+            return entry
+        metrics.count("registry_miss")
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and _unchanged(entry, stat):
+                return entry
+
+            digest = file_sha256(path)
+            if entry is not None and entry.sha256 == digest:
+                entry = replace(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            else:
+                value, elapsed, memory_bytes = _measured_load(loader, path)
+                entry = LoadedArtifact(
+                    value=value,
+                    path=path,
+                    mtime_ns=stat.st_mtime_ns,
+                    size=stat.st_size,
+                    sha256=digest,
+                    load_seconds=elapsed,
+                    memory_bytes=memory_bytes,
+                    loaded_at=time.time(),
+                )
+                print(
+                    f"Loaded '{path}' in {elapsed * 1000:.1f} ms "
+                    f"(+{memory_bytes / 1024:.0f} KiB RSS, sha256 {digest[:12]})."
+                )
+            self._entries[path] = entry
+            return entry
+
+    def peek(self, path=MODEL_PATH) -> Optional[LoadedArtifact]:
+        return self._entries.get(path)
+
+    def stats(self):
+        return {
+            path: {
+                "sha256": entry.sha256,
+                "size_bytes": entry.size,
+                "load_ms": entry.load_seconds * 1000,
+                "memory_bytes": entry.memory_bytes,
+                "loaded_at": entry.loaded_at,
+            }
+            for path, entry in list(self._entries.items())
+        }
+
+
+def _unchanged(entry, stat):
+    return entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size
+
+
+# Streamlit re-executes app.py on every rerun but imports this module once per
+# process, so this instance is what every session and thread shares.
+registry = ModelRegistry()
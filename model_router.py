@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+import numpy as np
+
+from batch_score import LABEL_COLUMN, Scorer, load_scorer, predict_chunk, read_checked_chunks
+from flat_forest import FLAT_MODEL_PATH, FlatForest
+from instrumentation import Histogram, metrics
+from lookup_table import FEATURES, INPUT_RANGES, SCORE_MAX, SCORE_MIN
+from model_registry import registry
+from predictor import Inference, WhatIf
+
+# Named model variants and their share of traffic, written by
+# ``model.py --variant``. Without a manifest only the default model is served.
+MODELS_MANIFEST = "models.json"
+MODELS_DIR = "models"
+DEFAULT_MODEL = "default"
+
+# Non-numeric columns a variant may be trained on, and how model.py encodes them
+CATEGORY_CODES = {"Gender": {"Female": 0, "Male": 1}}
+
+
+def default_manifest():
+    return {DEFAULT_MODEL: {"path": FLAT_MODEL_PATH, "weight": 1.0}}
+
+
+def load_manifest(path=MODELS_MANIFEST):
+    try:
+        with open(path) as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        return default_manifest()
+    manifest.setdefault(DEFAULT_MODEL, default_manifest()[DEFAULT_MODEL])
+    return manifest
+
+
+def register_variant(name, path, weight=0.0, manifest_path=MODELS_MANIFEST):
+    manifest = load_manifest(manifest_path)
+    manifest[name] = {"path": path, "weight": float(weight)}
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def variant_path(name):
+    return os.path.join(MODELS_DIR, f"{name}.flat")
+
+
+def encode_value(feature, value):
+    codes = CATEGORY_CODES.get(feature)
+    if codes is not None and isinstance(value, str):
+        try:
+            return codes[value]
+        except KeyError:
+            raise ValueError(f"Unknown {feature} {value!r}; expected one of {sorted(codes)}.")
+    return value
+
+
+def encode_frame(frame, features):
+    # Columns in the model's order, with categorical columns mapped to codes
+    columns = []
+    for name in features:
+        column = frame[name]
+        if name in CATEGORY_CODES:
+            column = column.map(CATEGORY_CODES[name])
+            if column.isna().any():
+                raise ValueError(f"Unknown {name} values; expected one of {sorted(CATEGORY_CODES[name])}.")
+        columns.append(column.to_numpy(dtype=np.float32))
+    return np.column_stack(columns) if columns else np.empty((len(frame), 0), dtype=np.float32)
+
+
+def _unit_interval(keys):
+    # splitmix64 finalizer: integer keys (row numbers) to well-spread points in [0, 1)
+    z = np.asarray(keys, dtype=np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / 2 ** 53
+
+
+def _key_point(key):
+    if isinstance(key, (int, np.integer)):
+        return float(_unit_interval([key])[0])
+    return int.from_bytes(hashlib.sha256(str(key).encode()).digest()[:8], "big") / 2 ** 64
+
+
+class _ModelStats:
+    def __init__(self):
+        self.requests = 0
+        self.predictions = 0
+        self.latency = Histogram()
+
+
+class ModelRouter:
+    """Serves several named model variants side by side for A/B tests.
+
+    Variants are flat artifacts loaded through the process-wide registry, so
+    each is mapped once per process; because they are read-only memory maps,
+    worker processes on the same host share the pages through the OS cache
+    rather than holding private copies. Requests name a variant or are
+    assigned one by traffic weight; a stable key (a session id, a row number)
+    keeps the assignment sticky.
+    """
+
+    def __init__(self, manifest_path=MODELS_MANIFEST):
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+        self._manifest = None
+        self._manifest_mtime = None
+        self._stats = {}
+
+    def manifest(self):
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if self._manifest is None or mtime != self._manifest_mtime:
+            with self._lock:
+                self._manifest = load_manifest(self.manifest_path)
+                self._manifest_mtime = mtime
+        return self._manifest
+
+    def names(self):
+        return list(self.manifest())
+
+    def _weights(self, available=None):
+        # (name, weight) of the variants taking traffic. With `available`, the
+        # input names a caller supplies, only variants that need nothing more
+        # are eligible, so a client sending five scores never lands on a
+        # variant that also wants Age and Gender.
+        weights = []
+        for name, entry in self.manifest().items():
+            weight = max(float(entry.get("weight", 0)), 0.0)
+            if weight > 0 and (available is None or set(self.features(name)) <= set(available)):
+                weights.append((name, weight))
+        return weights
+
+    def route(self, name=None, key=None, available=None):
+        manifest = self.manifest()
+        if name:
+            if name not in manifest:
+                raise ValueError(f"Unknown model {name!r}; available: {', '.join(manifest)}.")
+            return name
+        weights = self._weights(available)
+        total = sum(weight for _, weight in weights)
+        if total <= 0:
+            return DEFAULT_MODEL
+        point = (random.random() if key is None else _key_point(key)) * total
+        for candidate, weight in weights:
+            point -= weight
+            if point < 0:
+                return candidate
+        return weights[-1][0]
+
+    def assign(self, keys, available=None):
+        # Vectorized route() for integer keys such as row numbers
+        eligible = self._weights(available)
+        if not eligible:
+            return np.full(len(keys), DEFAULT_MODEL, dtype=object)
+        names = [name for name, _ in eligible]
+        weights = np.array([weight for _, weight in eligible])
+        bounds = np.cumsum(weights) / weights.sum()
+        index = np.minimum(np.searchsorted(bounds, _unit_interval(keys), side="right"), len(names) - 1)
+        return np.asarray(names, dtype=object)[index]
+
+    def weighted_names(self, available=None):
+        return [name for name, _ in self._weights(available)] or [DEFAULT_MODEL]
+
+    def scorer(self, name=DEFAULT_MODEL):
+        path = self.manifest()[name]["path"]
+        if name == DEFAULT_MODEL and path == FLAT_MODEL_PATH:
+            # The regular loader: pickle fallback and the lookup table
+            return load_scorer(flat_path=path)
+        artifact = registry.get(path, loader=FlatForest.load)
+        model = artifact.value
+        return Scorer(model, model.classes, None, model.header["model_sha256"], artifact,
+                      model.header.get("data_sha256"), model.header.get("training_key"))
+
+    def features(self, name=DEFAULT_MODEL):
+        model = self.scorer(name).model
+        return list(model.features) if isinstance(model, FlatForest) else FEATURES
+
+    def encode_row(self, name, values):
+        # values maps feature name to score (or category); returns a 1 x n row
+        features = self.features(name)
+        missing = [feature for feature in features if feature not in values]
+        if missing:
+            raise ValueError(f"Model {name!r} also needs: {', '.join(missing)}.")
+        return np.array([[encode_value(f, values[f]) for f in features]], dtype=np.float32)
+
+    def predict(self, name, X):
+        # X is already in the variant's feature order; returns (class names, class index, probabilities)
+        scorer = self.scorer(name)
+        start = time.perf_counter()
+        table = scorer.table if X.shape[1] == len(FEATURES) else None
+        labels, proba = predict_chunk(scorer.model, table, X)
+        self.observe(name, time.perf_counter() - start, len(X))
+        return scorer.class_names, labels, proba
+
+    def infer(self, name, values, k=3):
+        # Single-row counterpart of Predictor.infer for any variant
+        class_names, labels, proba = self.predict(name, self.encode_row(name, values))
+        proba = proba[0]
+        order = np.argsort(-proba, kind="stable")[:k]
+        ranked = np.sort(proba)[::-1]
+        margin = float(ranked[0] - ranked[1]) if len(ranked) > 1 else 1.0
+        inference = Inference(
+            class_names[labels[0]], proba, [(class_names[i], float(proba[i])) for i in order], margin
+        )
+        return class_names, inference
+
+    def sensitivity(self, name, values):
+        # Variant counterpart of Predictor.sensitivity: each Big Five score
+        # varied over the scale with every other input, demographics included,
+        # held at `values`. Not counted in the variant's prediction stats.
+        scorer = self.scorer(name)
+        features = self.features(name)
+        levels = np.arange(SCORE_MIN, SCORE_MAX + 1)
+        X = np.tile(self.encode_row(name, values)[0], (len(FEATURES), len(levels), 1))
+        for i, feature in enumerate(FEATURES):
+            X[i, :, features.index(feature)] = levels
+        table = scorer.table if len(features) == len(FEATURES) else None
+        labels, proba = predict_chunk(scorer.model, table, X.reshape(-1, len(features)))
+        labels = scorer.class_names[labels].reshape(len(FEATURES), len(levels))
+        return scorer.class_names, WhatIf(levels, labels, proba.reshape(len(FEATURES), len(levels), -1))
+
+    def observe(self, name, seconds, rows=1):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _ModelStats()
+            stats.requests += 1
+            stats.predictions += rows
+            stats.latency.observe(seconds * 1000)
+        metrics.observe(f"predict[{name}]", seconds * 1000)
+        metrics.count(f"predictions[{name}]", rows)
+
+    def stats(self):
+        manifest = self.manifest()
+        with self._lock:
+            return {
+                name: {
+                    "weight": float(manifest.get(name, {}).get("weight", 0)),
+                    "requests": s.requests,
+                    "predictions": s.predictions,
+                    "mean_ms": s.latency.total / s.latency.count if s.latency.count else 0.0,
+                    "p50_ms": s.latency.quantile(0.5),
+                    "p99_ms": s.latency.quantile(0.99),
+                }
+                for name, s in sorted(self._stats.items())
+            }
+
+
+def score_routed_chunk(router, chunk, assigned, keep_input=False):
+    # assigned holds the variant name for each row of chunk
+    import pandas as pd
+
+    out = chunk.reset_index(drop=True) if keep_input else pd.DataFrame(index=pd.RangeIndex(len(chunk)))
+    labels = np.empty(len(chunk), dtype=object)
+    proba = class_names = None
+    for name in np.unique(assigned):
+        mask = assigned == name
+        names, index, rows = router.predict(name, encode_frame(chunk[mask], router.features(name)))
+        if class_names is None:
+            class_names = names
+            proba = np.empty((len(chunk), len(names)), dtype=np.float32)
+        elif list(names) != list(class_names):
+            raise ValueError(f"Model {name!r} predicts different classes than the other variants.")
+        labels[mask] = names[index]
+        proba[mask] = rows
+    out[LABEL_COLUMN] = labels
+    out["model"] = assigned
+    for i, name in enumerate(class_names if class_names is not None else []):
+        out[f"proba_{name}"] = proba[:, i]
+    return out
+
+
+def csv_columns(path):
+    import pandas as pd
+
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def iter_routed_chunks(input_path, router, model_name=None, chunksize=100_000, keep_input=False):
+    # One named variant for every row, or rows split by traffic weight on row
+    # number among the variants whose inputs the file has
+    available = None if model_name else csv_columns(input_path)
+    names = [router.route(model_name)] if model_name else router.weighted_names(available)
+    features = list(dict.fromkeys(f for name in names for f in router.features(name)))
+    usecols = None if keep_input else features
+    numeric = [name for name in features if name in INPUT_RANGES]
+    offset = 0
+    for chunk in read_checked_chunks(input_path, usecols, numeric, chunksize):
+        if model_name:
+            assigned = np.full(len(chunk), names[0], dtype=object)
+        else:
+            assigned = router.assign(np.arange(offset, offset + len(chunk)), available)
+        offset += len(chunk)
+        yield score_routed_chunk(router, chunk, assigned, keep_input)
+
+
+# One per process, like the model registry it loads through
+router = ModelRouter()
@@ -0,0 +1,134 @@
+import threading
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+from flat_forest import FlatForest
+from lookup_table import FEATURES, SCORE_MAX, SCORE_MIN, score_index
+
+WHATIF_CACHE_SIZE = 1024
+
+
+class Inference(NamedTuple):
+    label: str
+    probabilities: np.ndarray
+    top_k: List[Tuple[str, float]]
+    margin: float  # top probability minus the runner-up
+
+
+class BatchInference(NamedTuple):
+    labels: np.ndarray
+    probabilities: np.ndarray
+    top_k: np.ndarray  # (n, k) class names, most likely first
+    margins: np.ndarray
+
+
+class WhatIf(NamedTuple):
+    levels: np.ndarray  # the 1-10 scale
+    labels: np.ndarray  # (5, 10) predicted class per feature and level
+    probabilities: np.ndarray  # (5, 10, n_classes)
+
+
+class Predictor:
+    """Single-row prediction without the pandas round-trip.
+
+    The feature order is checked once here against the names stored with the
+    model, so individual calls can pass plain ints or a NumPy row.
+    """
+
+    def __init__(self, model, class_names, table=None):
+        names = model.features if isinstance(model, FlatForest) else getattr(model, "feature_names_in_", None)
+        if names is not None and list(names) != FEATURES:
+            raise ValueError(f"Model expects features {list(names)}, not {FEATURES}.")
+        self.model = model
+        self.class_names = np.asarray(class_names)
+        self.table = table
+        # Memoized per Predictor, so a model reload also starts a fresh cache
+        self.sensitivity = lru_cache(maxsize=WHATIF_CACHE_SIZE)(self._sensitivity)
+        if isinstance(model, FlatForest):
+            self._proba = model.predict_proba
+        elif hasattr(model, "estimators_"):
+            self._trees = list(model.estimators_)
+            self._proba = self._forest_proba
+        else:
+            self._proba = self._tree_proba
+
+    def _forest_proba(self, X):
+        # What RandomForestClassifier.predict_proba does, minus input validation
+        # and the feature-name check that forces callers to build a DataFrame.
+        proba = self._trees[0].predict_proba(X, check_input=False)
+        for tree in self._trees[1:]:
+            proba += tree.predict_proba(X, check_input=False)
+        return proba / len(self._trees)
+
+    def _tree_proba(self, X):
+        return self.model.predict_proba(X, check_input=False)
+
+    def infer(self, openness, neuroticism, conscientiousness, agreeableness, extraversion, k=3):
+        label, proba = self.predict(openness, neuroticism, conscientiousness, agreeableness, extraversion)
+        order = np.argsort(-proba, kind="stable")[:k]
+        ranked = np.sort(proba)[::-1]
+        margin = float(ranked[0] - ranked[1]) if len(ranked) > 1 else 1.0
+        return Inference(
+            label,
+            proba,
+            [(self.class_names[i], float(proba[i])) for i in order],
+            margin,
+        )
+
+    def infer_batch(self, X, k=3):
+        # X is (n, 5) in FEATURES order; one probability pass for all outputs
+        X = np.asarray(X)
+        if self.table is not None and X.size and SCORE_MIN <= X.min() and X.max() <= SCORE_MAX:
+            rows = self.table[score_index(X)]
+            proba = np.asarray(rows["proba"], dtype=np.float64)
+            label_index = rows["label"].astype(np.intp)
+        else:
+            proba = self._proba(np.ascontiguousarray(X, dtype=np.float32))
+            label_index = proba.argmax(axis=1)
+        top_k = np.argsort(-proba, axis=1, kind="stable")[:, :k]
+        ranked = -np.sort(-proba, axis=1)
+        margin = ranked[:, 0] - ranked[:, 1] if proba.shape[1] > 1 else np.ones(len(proba))
+        return BatchInference(self.class_names[label_index], proba, self.class_names[top_k], margin)
+
+    def _sensitivity(self, scores):
+        # For each feature, vary it over the whole scale with the other four
+        # held at `scores`: 5 x 10 inputs answered in a single batch.
+        levels = np.arange(SCORE_MIN, SCORE_MAX + 1)
+        X = np.tile(np.asarray(scores, dtype=np.int64), (len(FEATURES), len(levels), 1))
+        for i in range(len(FEATURES)):
+            X[i, :, i] = levels
+        result = self.infer_batch(X.reshape(-1, len(FEATURES)), k=1)
+        labels = result.labels.reshape(len(FEATURES), len(levels))
+        proba = result.probabilities.reshape(len(FEATURES), len(levels), -1)
+        labels.flags.writeable = False
+        proba.flags.writeable = False
+        return WhatIf(levels, labels, proba)
+
+    def predict_row(self, row):
+        # row holds the five scores in FEATURES order; returns (label, probabilities)
+        row = np.asarray(row)
+        if self.table is not None and SCORE_MIN <= row.min() and row.max() <= SCORE_MAX:
+            entry = self.table[score_index(row)]
+            return self.class_names[entry["label"]], np.asarray(entry["proba"], dtype=np.float64)
+        proba = self._proba(np.ascontiguousarray(row, dtype=np.float32).reshape(1, -1))[0]
+        return self.class_names[proba.argmax()], proba
+
+    def predict(self, openness, neuroticism, conscientiousness, agreeableness, extraversion):
+        return self.predict_row((openness, neuroticism, conscientiousness, agreeableness, extraversion))
+
+
+_current = None
+_current_lock = threading.Lock()
+
+
+def get_predictor(scorer):
+    # Rebuilt (and the feature order re-checked) only when the registry hands
+    # back a different model or table, i.e. after the artifacts changed on disk.
+    global _current
+    predictor = _current
+    if predictor is None or predictor.model is not scorer.model or predictor.table is not scorer.table:
+        with _current_lock:
+            predictor = _current = Predictor(scorer.model, scorer.class_names, scorer.table)
+    return predictor
@@ -0,0 +1,139 @@
+import argparse
+import io
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from lookup_table import FEATURES
+
+REPORT_CACHE_SIZE = 256
+
+# Personality descriptions
+personality_descriptions = {
+    "extraverted": "You are likely outgoing, sociable, and energetic. You enjoy being around others and are often the life of the party. You thrive in social settings and feel energized by interacting with people.",
+    "serious": "You tend to be thoughtful, disciplined, and goal-oriented. You approach tasks with a structured and organized mindset, and you value responsibility and reliability in yourself and others.",
+    "dependable": "You are reliable, trustworthy, and responsible. People can count on you to follow through on your commitments. You are practical and well-organized, making you a cornerstone in any team or family.",
+    "lively": "You are enthusiastic, cheerful, and full of energy. You bring a positive and vibrant attitude to everything you do. Your spontaneity and optimism are contagious, and you enjoy new and exciting experiences.",
+    "responsible": "You are conscientious, diligent, and accountable for your actions. You have a strong sense of duty and take your obligations seriously. You are a planner and prefer to be prepared for all outcomes.",
+}
+
+# Order in which scores appear in reports, mapped to the model's feature names
+REPORT_TRAITS = [
+    ("Openness", "openness"),
+    ("Conscientiousness", "conscientiousness"),
+    ("Extraversion", "extraversion"),
+    ("Agreeableness", "agreeableness"),
+    ("Neuroticism", "neuroticism"),
+]
+
+PDF_THEMES = {
+    "light": {"page": (1, 1, 1), "text": (0, 0, 0)},
+    "dark": {"page": (0, 0, 0), "text": (1, 1, 1)},
+}
+
+
+def report_filename(prediction_label, extension):
+    return f"personality_report_{prediction_label}.{extension}"
+
+
+# scores is a tuple in FEATURES order so it can be part of the cache key. The
+# date is the prediction timestamp, so a report stays identical across reruns.
+@lru_cache(maxsize=REPORT_CACHE_SIZE)
+def text_report(prediction_label, scores, date):
+    by_name = dict(zip(FEATURES, scores))
+    lines = [
+        "Personality Insight Report",
+        f"Date: {date}",
+        f"Dominant Trait: {prediction_label.capitalize()}",
+        f"Description: {personality_descriptions.get(prediction_label)}",
+        "Big Five Scores:",
+    ]
+    lines += [f"- {title}: {by_name[name]}/10" for title, name in REPORT_TRAITS]
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=REPORT_CACHE_SIZE)
+def pdf_report(prediction_label, scores, theme, date):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    colors = PDF_THEMES.get(theme, PDF_THEMES["light"])
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    c.setFillColorRGB(*colors["page"])
+    c.rect(0, 0, width, height, stroke=0, fill=1)
+    c.setFillColorRGB(*colors["text"])
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(100, height - 100, "Personality Insight Report")
+    c.setFont("Helvetica", 12)
+    y = height - 150
+    for line in text_report(prediction_label, scores, date).split("\n"):
+        c.drawString(100, y, line)
+        y -= 20
+    c.save()
+    return buffer.getvalue()
+
+
+def _render_batch(task):
+    records, fmt, theme, date = task
+    rendered = []
+    for index, label, scores in records:
+        if fmt == "pdf":
+            data = pdf_report(label, scores, theme, date)
+        else:
+            data = text_report(label, scores, date).encode()
+        rendered.append((f"{index:08d}_{report_filename(label, fmt)}", data))
+    return rendered
+
+
+def render_reports_zip(records, path, fmt="pdf", theme="light", date=None, workers=None,
+                       batch_size=200):
+    # records is an iterable of (label, scores) pairs, scores in FEATURES order
+    date = date or time.strftime("%Y-%m-%d %H:%M")
+    records = [(i, str(label), tuple(int(v) for v in scores)) for i, (label, scores) in enumerate(records)]
+    tasks = [(records[i : i + batch_size], fmt, theme, date) for i in range(0, len(records), batch_size)]
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        # map() yields batches in submission order, so the archive is ordered too
+        for rendered in pool.map(_render_batch, tasks):
+            for name, data in rendered:
+                archive.writestr(name, data)
+                count += 1
+    return count
+
+
+def main(argv=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(
+        description="Render one report per row of a scored CSV (batch_score.py --keep-input) into a zip."
+    )
+    parser.add_argument("input")
+    parser.add_argument("output", help="Zip file to write.")
+    parser.add_argument("--format", choices=["pdf", "txt"], default="pdf")
+    parser.add_argument("--theme", choices=sorted(PDF_THEMES), default="light")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--label-column", default="predicted_personality")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        print(f"Error: '{args.input}' not found.")
+        return 1
+
+    data = pd.read_csv(args.input, usecols=FEATURES + [args.label_column])
+    records = zip(data[args.label_column], data[FEATURES].itertuples(index=False, name=None))
+    start = time.perf_counter()
+    count = render_reports_zip(records, args.output, args.format, args.theme, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {count} {args.format.upper()} reports in {elapsed:.2f}s "
+          f"({count / max(elapsed, 1e-9):,.0f} reports/sec) -> '{args.output}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from aiohttp import web
+
+from batch_score import load_scorer, predict_chunk
+from flat_forest import FLAT_MODEL_PATH
+from lookup_table import FEATURES, INPUT_RANGES, TABLE_PATH
+from model_registry import MODEL_PATH
+from model_router import CATEGORY_CODES, DEFAULT_MODEL, encode_value, router
+
+
+class MicroBatcher:
+    """Collects concurrent single-row requests into one vectorized predict call.
+
+    A batch is flushed once it holds ``max_batch_size`` rows or ``max_wait_ms``
+    after its first row arrived, whichever comes first.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=64, max_wait_ms=2.0):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self._queue = None
+        self._task = None
+        # One worker thread keeps batches ordered and off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="predict")
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, row):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(items) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # A bad batch fails its own requests; the loop keeps serving the rest
+            try:
+                X = np.array([row for row, _ in items], dtype=np.int64)
+                results = await loop.run_in_executor(self._executor, self.predict_batch, X)
+            except Exception as exc:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.rows += len(items)
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+def _results(class_names, indices, proba, model_name):
+    names = [str(name) for name in class_names]
+    return [
+        {"label": names[i], "probabilities": dict(zip(names, map(float, row))), "model": model_name}
+        for i, row in zip(indices, proba)
+    ]
+
+
+def make_predictor(model_path=MODEL_PATH, table_path=TABLE_PATH, flat_path=FLAT_MODEL_PATH):
+    def predict_batch(X):
+        # The registry only re-reads the artifacts when their files change
+        start = time.perf_counter()
+        scorer = load_scorer(model_path, table_path, flat_path)
+        indices, proba = predict_chunk(scorer.model, scorer.table, X)
+        router.observe(DEFAULT_MODEL, time.perf_counter() - start, len(X))
+        return _results(scorer.class_names, indices, proba, DEFAULT_MODEL)
+
+    return predict_batch
+
+
+def make_variant_predictor(name):
+    def predict_batch(X):
+        class_names, indices, proba = router.predict(name, X)
+        return _results(class_names, indices, proba, name)
+
+    return predict_batch
+
+
+def parse_row(row, features=FEATURES):
+    if isinstance(row, dict):
+        missing = [name for name in features if name not in row]
+        if missing:
+            raise ValueError(f"Missing scores: {', '.join(missing)}.")
+        row = [encode_value(name, row[name]) for name in features]
+    if not isinstance(row, list) or len(row) != len(features):
+        raise ValueError(f"Each row needs {len(features)} scores in the order {features}.")
+    if not all(isinstance(value, int) and not isinstance(value, bool) for value in row):
+        raise ValueError("Scores must be integers.")
+    for name, value in zip(features, row):
+        if name in INPUT_RANGES:
+            low, high = INPUT_RANGES[name]
+            if not low <= value <= high:
+                raise ValueError(f"{name} must be between {low} and {high}, got {value}.")
+        elif name in CATEGORY_CODES and value not in CATEGORY_CODES[name].values():
+            raise ValueError(f"Unknown {name} code {value}.")
+    return row
+
+
+def _supplied(rows):
+    # Input names every row provides; a plain list is the five scores
+    supplied = None
+    for row in rows:
+        names = set(row) if isinstance(row, dict) else set(FEATURES)
+        supplied = names if supplied is None else supplied & names
+    return supplied or set()
+
+
+def _route(body, rows):
+    # Pick the variant by "model" name, else by traffic weight (sticky per
+    # "session") among the variants the rows have every input for
+    name = router.route(body.get("model"), key=body.get("session"), available=_supplied(rows))
+    return name, FEATURES if name == DEFAULT_MODEL else router.features(name)
+
+
+async def get_batcher(app, name):
+    batchers = app["batchers"]
+    if name not in batchers:
+        predict_batch = app["predict_batch"] if name == DEFAULT_MODEL else make_variant_predictor(name)
+        batcher = MicroBatcher(predict_batch, app["max_batch_size"], app["max_wait_ms"])
+        await batcher.start()
+        batchers[name] = batcher
+    return batchers[name]
+
+
+async def handle_predict(request):
+    try:
+        body = await request.json()
+        if not isinstance(body, dict):
+            raise ValueError("Expected a JSON object with 'scores'.")
+        name, features = _route(body, [body.get("scores")])
+        row = parse_row(body.get("scores"), features)
+    except ValueError as exc:
+        raise web.HTTPBadRequest(text=str(exc))
+    batcher = await get_batcher(request.app, name)
+    result = await batcher.submit(row)
+    return web.json_response(result)
+
+
+async def handle_predict_bulk(request):
+    try:
+        body = await request.json()
+        rows = body.get("rows") if isinstance(body, dict) else None
+        if not isinstance(rows, list) or not rows:
+            raise ValueError("'rows' must be a non-empty list.")
+        if len(rows) > request.app["max_bulk_rows"]:
+            raise ValueError(f"At most {request.app['max_bulk_rows']} rows per request.")
+        name, features = _route(body, rows)
+        X = np.array([parse_row(row, features) for row in rows], dtype=np.int64)
+    except (ValueError, OverflowError) as exc:
+        raise web.HTTPBadRequest(text=str(exc))
+    predict_batch = request.app["predict_batch"] if name == DEFAULT_MODEL else make_variant_predictor(name)
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(None, predict_batch, X)
+    return web.json_response({"predictions": results})
+
+
+async def handle_health(request):
+    batchers = request.app["batchers"].values()
+    return web.json_response(
+        {
+            "status": "ok",
+            "batches": sum(batcher.batches for batcher in batchers),
+            "batched_rows": sum(batcher.rows for batcher in batchers),
+            "models": router.stats(),
+        }
+    )
+
+
+def create_app(model_path=MODEL_PATH, table_path=TABLE_PATH, max_batch_size=64,
+               max_wait_ms=2.0, max_bulk_rows=10_000, flat_path=FLAT_MODEL_PATH):
+    predict_batch = make_predictor(model_path, table_path, flat_path)
+    # Load once up front so the first request doesn't pay for loading
+    load_scorer(model_path, table_path, flat_path)
+
+    app = web.Application()
+    app["predict_batch"] = predict_batch
+    # One micro-batcher per model variant, created on the first request routed to it
+    app["batchers"] = {}
+    app["max_batch_size"] = max_batch_size
+    app["max_wait_ms"] = max_wait_ms
+    app["max_bulk_rows"] = max_bulk_rows
+
+    async def on_startup(app):
+        await get_batcher(app, DEFAULT_MODEL)
+
+    async def on_cleanup(app):
+        for batcher in app["batchers"].values():
+            await batcher.stop()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post("/predict", handle_predict)
+    app.router.add_post("/predict/bulk", handle_predict_bulk)
+    app.router.add_get("/health", handle_health)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP prediction server with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--table", default=TABLE_PATH)
+    parser.add_argument("--flat-model", default=FLAT_MODEL_PATH)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--max-bulk-rows", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    app = create_app(args.model, args.table, args.max_batch_size, args.max_wait_ms,
+                     args.max_bulk_rows, args.flat_model)
+    web.run_app(app, host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
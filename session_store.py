@@ -0,0 +1,180 @@
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+
+from history_store import SESSION_HISTORY_LIMIT
+
+# Sessions idle for longer than this lose their results, as do the least
+# recently used ones beyond MAX_SESSIONS.
+SESSION_TTL_SECONDS = 30 * 60
+MAX_SESSIONS = 2000
+# How often get() sweeps for idle sessions
+EVICT_EVERY = 50
+
+# One history entry: the five scores (uint8, FEATURES order), the class index
+# (uint8) and a uint32 Unix timestamp -- 10 bytes instead of a nested dict.
+_ENTRY = struct.Struct("<5BBI")
+
+
+class CompactHistory:
+    """The session's last SESSION_HISTORY_LIMIT assessments, packed in a bytearray."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self):
+        self._data = bytearray()
+
+    def append(self, scores, class_index, timestamp):
+        self._data += _ENTRY.pack(*(int(score) for score in scores), int(class_index), int(timestamp))
+        excess = len(self._data) - SESSION_HISTORY_LIMIT * _ENTRY.size
+        if excess > 0:
+            del self._data[:excess]
+
+    def __len__(self):
+        return len(self._data) // _ENTRY.size
+
+    def __iter__(self):
+        # (scores tuple, class index, timestamp), oldest first
+        for *scores, class_index, timestamp in _ENTRY.iter_unpack(bytes(self._data)):
+            yield tuple(scores), class_index, timestamp
+
+    def last_timestamp(self):
+        if not self._data:
+            return None
+        return _ENTRY.unpack_from(self._data, len(self._data) - _ENTRY.size)[-1]
+
+    @property
+    def nbytes(self):
+        return sys.getsizeof(self._data)
+
+
+class SessionData:
+    """Results kept for one browser session.
+
+    Class names are a reference to the model's shared array, so a session
+    only owns its probability vector and packed history.
+    """
+
+    __slots__ = ("class_index", "probabilities", "class_names", "model", "history", "last_seen")
+
+    def __init__(self, now):
+        self.class_index = None
+        self.probabilities = None
+        self.class_names = None
+        self.model = None
+        self.history = CompactHistory()
+        self.last_seen = now
+
+    def record(self, class_names, label, probabilities, model, scores, timestamp):
+        # scores in FEATURES order
+        self.class_names = class_names
+        self.probabilities = np.asarray(probabilities, dtype=np.float32)
+        self.class_index = int(np.flatnonzero(np.asarray(class_names) == label)[0])
+        self.model = model
+        self.history.append(scores, self.class_index, timestamp)
+
+    @property
+    def label(self):
+        return None if self.class_index is None else str(self.class_names[self.class_index])
+
+    def confidence(self, k=3):
+        proba = self.probabilities
+        order = np.argsort(-proba, kind="stable")
+        margin = float(proba[order[0]] - proba[order[1]]) if len(proba) > 1 else 1.0
+        return {
+            "model": self.model,
+            "probabilities": {str(name): float(p) for name, p in zip(self.class_names, proba)},
+            "top_k": [(str(self.class_names[i]), float(proba[i])) for i in order[:k]],
+            "margin": margin,
+        }
+
+    def last_date(self):
+        timestamp = self.history.last_timestamp()
+        return None if timestamp is None else datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+    def nbytes(self):
+        size = sys.getsizeof(self) + self.history.nbytes
+        if self.probabilities is not None:
+            size += self.probabilities.nbytes
+        return size
+
+
+class SessionStore:
+    """Process-wide per-session results with LRU and idle-time eviction.
+
+    Streamlit only frees ``st.session_state`` when a browser tab disconnects,
+    so tabs left open keep their results forever. Keeping the results here,
+    keyed by a session id, bounds both the number of sessions and how long an
+    idle one is held.
+    """
+
+    def __init__(self, ttl_seconds=SESSION_TTL_SECONDS, max_sessions=MAX_SESSIONS,
+                 clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self.evicted = 0
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def get(self, session_id):
+        now = self.clock()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = SessionData(now)
+            else:
+                self._sessions.move_to_end(session_id)
+                session.last_seen = now
+            self._calls += 1
+            if self._calls % EVICT_EVERY == 0 or len(self._sessions) > self.max_sessions:
+                self._evict(now)
+        return session
+
+    def evict(self):
+        with self._lock:
+            return self._evict(self.clock())
+
+    def _evict(self, now):
+        # Oldest first: stop at the first session that is both recent and within the cap
+        evicted = 0
+        cutoff = now - self.ttl_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_seen >= cutoff and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+            evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        with self._lock:
+            sizes = [session.nbytes() for session in self._sessions.values()]
+        return {
+            "sessions": len(sizes),
+            "bytes": sum(sizes),
+            "largest_bytes": max(sizes, default=0),
+            "evicted": self.evicted,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore()
+        return _store
@@ -0,0 +1,59 @@
+from functools import lru_cache
+
+# Served by Streamlit's static file server (see .streamlit/config.toml), so the
+# browser downloads and caches the stylesheet once instead of on every rerun.
+STYLESHEET_URL = "app/static/app.css"
+
+# Define colors based on theme (black and white only, monochrome)
+THEME_COLORS = {
+    "dark": {
+        "bg": "#000000",
+        "secondary_bg": "#111111",
+        "glass_bg": "rgba(17, 17, 17, 0.9)",
+        "text": "#ffffff",
+        "text_secondary": "#cccccc",
+        "primary": "#666666",
+        "primary_hover": "#888888",
+        "accent": "#999999",
+        "card_bg": "rgba(17, 17, 17, 0.95)",
+        "border": "#333333",
+        "shadow": "0 25px 50px -12px rgba(0, 0, 0, 0.5)",
+    },
+    "light": {
+        "bg": "#ffffff",
+        "secondary_bg": "#f5f5f5",
+        "glass_bg": "rgba(255, 255, 255, 0.95)",
+        "text": "#000000",
+        "text_secondary": "#333333",
+        "primary": "#666666",
+        "primary_hover": "#444444",
+        "accent": "#555555",
+        "card_bg": "rgba(255, 255, 255, 0.98)",
+        "border": "#dddddd",
+        "shadow": "0 25px 50px -12px rgba(0, 0, 0, 0.1)",
+    },
+}
+
+
+def theme_name(dark_mode):
+    return "dark" if dark_mode else "light"
+
+
+def get_theme_colors(theme):
+    return THEME_COLORS[theme]
+
+
+@lru_cache(maxsize=len(THEME_COLORS))
+def theme_css(theme):
+    # The only per-theme part of the styling: CSS variables used by app.css
+    variables = ";".join(
+        f"--{name.replace('_', '-')}:{value}" for name, value in THEME_COLORS[theme].items()
+    )
+    return (
+        f'<link rel="stylesheet" href="{STYLESHEET_URL}">'
+        f"<style>:root{{{variables}}}</style>"
+    )
+
+
+def css_payload_bytes(theme):
+    return len(theme_css(theme).encode())
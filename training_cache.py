@@ -0,0 +1,66 @@
+import hashlib
+import json
+import os
+import platform
+import shutil
+
+from flat_forest import read_header
+
+CACHE_DIR = os.path.join('.cache', 'artifacts')
+
+
+def library_versions():
+    import numpy
+    import pandas
+    import sklearn
+
+    return {
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'scikit-learn': sklearn.__version__,
+    }
+
+
+def training_key(data_sha256, columns_to_drop, settings):
+    # Everything that can change the trained artifacts, and nothing that can't
+    # (n_jobs, output paths), goes into the key.
+    material = {
+        'data_sha256': data_sha256,
+        'columns_to_drop': sorted(columns_to_drop),
+        'settings': settings,
+        'versions': library_versions(),
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def live_key(flat_path):
+    # Read from the flat artifact's JSON header, which avoids unpickling the model
+    try:
+        return read_header(flat_path).get('training_key')
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _copy_atomic(src, dst):
+    tmp_path = dst + '.tmp'
+    shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+def restore(key, paths, cache_dir=CACHE_DIR):
+    entry = os.path.join(cache_dir, key[:32])
+    sources = [os.path.join(entry, os.path.basename(path)) for path in paths]
+    if not all(os.path.exists(src) for src in sources):
+        return False
+    for src, dst in zip(sources, paths):
+        _copy_atomic(src, dst)
+    return True
+
+
+def store(key, paths, cache_dir=CACHE_DIR):
+    entry = os.path.join(cache_dir, key[:32])
+    os.makedirs(entry, exist_ok=True)
+    for path in paths:
+        _copy_atomic(path, os.path.join(entry, os.path.basename(path)))
+    return entry